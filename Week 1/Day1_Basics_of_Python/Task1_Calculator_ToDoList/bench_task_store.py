@@ -0,0 +1,68 @@
+"""Add / mark / list timings for TaskStore at a million tasks.
+
+    python bench_task_store.py --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from task_store import Task, TaskStore
+
+
+def timed(label: str, fn, ops: int = 1):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    per_op = f"  ({elapsed / ops * 1e6:.1f} us/op)" if ops > 1 else ""
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms{per_op}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--marks", type=int, default=10_000)
+    parser.add_argument("--pages", type=int, default=1_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "todo.db")
+        with TaskStore(path) as store:
+            timed(f"add_many {args.tasks:,}", lambda: store.add_many(f"Task number {i}" for i in range(args.tasks)),
+                  args.tasks)
+            timed("add (one transaction each) x1,000", lambda: [store.add("One more task") for _ in range(1000)], 1000)
+
+            ids = [rng.randint(1, args.tasks) for _ in range(args.marks)]
+            timed(f"mark by id x{args.marks:,}", lambda: [store.mark(i) for i in ids], args.marks)
+
+            timed("count pending", lambda: store.count("pending"))
+            timed("first page, all", lambda: store.page())
+            timed("first page, completed", lambda: store.page("completed"))
+            starts = [rng.randint(0, args.tasks) for _ in range(args.pages)]
+            timed(f"random deep page, pending x{args.pages:,}", lambda: [store.page("pending", s) for s in starts],
+                  args.pages)
+            timed(f"random deep page, completed x{args.pages:,}", lambda: [store.page("completed", s) for s in starts],
+                  args.pages)
+
+            def walk_completed():
+                last, n = 0, 0
+                while page := store.page("completed", last, limit=500):
+                    n += len(page)
+                    last = page[-1].id
+                return n
+
+            n = timed("walk all completed (500/page)", walk_completed)
+            print(f"  {n:,} completed tasks")
+        print(f"db size: {os.path.getsize(path) / 1e6:.1f} MB")
+
+    as_dict = {"id": 1, "task": "Task number 1", "completed": False}
+    print(f"record size: Task with __slots__ {sys.getsizeof(Task(1, 'Task number 1', False))} B, "
+          f"dict {sys.getsizeof(as_dict)} B")
+
+
+if __name__ == "__main__":
+    main()
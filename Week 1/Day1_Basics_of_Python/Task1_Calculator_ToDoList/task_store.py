@@ -0,0 +1,94 @@
+import sqlite3
+from typing import Iterable, List, Optional
+
+# Listing filters: None for every task, else only pending or completed ones
+STATUSES = {"pending": 0, "completed": 1}
+
+
+class Task:
+    __slots__ = ("id", "task", "completed")
+
+    def __init__(self, id: int, task: str, completed: bool):
+        self.id = id
+        self.task = task
+        self.completed = completed
+
+    def __repr__(self):
+        return f"Task({self.id}, {self.task!r}, completed={self.completed})"
+
+
+class TaskStore:
+    """To-do tasks in SQLite.
+
+    Ids are the table's rowid, so marking a task is a single primary-key
+    update, and the (completed, id) index lets status-filtered pages start
+    right after the last id seen (keyset pagination) instead of scanning
+    past an OFFSET.
+    """
+
+    def __init__(self, path: str = "todo.db"):
+        self.conn = sqlite3.connect(path)
+        # WAL with NORMAL sync is durable across crashes and skips an fsync per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY, task TEXT NOT NULL, completed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (completed, id)")
+        self.conn.commit()
+
+    def add(self, task: str) -> int:
+        with self.conn:
+            return self.conn.execute("INSERT INTO tasks (task) VALUES (?)", (task,)).lastrowid
+
+    def add_many(self, tasks: Iterable[str], batch_size: int = 10_000) -> int:
+        """Insert in one transaction per batch; returns the number added."""
+        added = 0
+        batch = []
+        for task in tasks:
+            batch.append((task,))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, rows) -> int:
+        with self.conn:
+            self.conn.executemany("INSERT INTO tasks (task) VALUES (?)", rows)
+        return len(rows)
+
+    def mark(self, task_id: int, completed: bool = True) -> bool:
+        """Set a task's status by id; False if there is no such task."""
+        with self.conn:
+            cur = self.conn.execute("UPDATE tasks SET completed = ? WHERE id = ?", (int(completed), task_id))
+        return cur.rowcount == 1
+
+    def page(self, status: Optional[str] = None, after_id: int = 0, limit: int = 20) -> List[Task]:
+        """Up to `limit` tasks with id > after_id, in id order; pass the last id for the next page."""
+        if status is None:
+            rows = self.conn.execute(
+                "SELECT id, task, completed FROM tasks WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+            )
+        else:
+            rows = self.conn.execute(
+                "SELECT id, task, completed FROM tasks WHERE completed = ? AND id > ? ORDER BY id LIMIT ?",
+                (STATUSES[status], after_id, limit),
+            )
+        return [Task(i, t, bool(c)) for i, t, c in rows]
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE completed = ?", (STATUSES[status],)).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
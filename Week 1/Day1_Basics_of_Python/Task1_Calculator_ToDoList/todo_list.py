@@ -1,4 +1,11 @@
-todo_List = []
+from pathlib import Path
+
+from task_store import TaskStore
+
+PAGE_SIZE = 20
+
+# Tasks persist in todo.db next to this script
+store = TaskStore(str(Path(__file__).with_name("todo.db")))
 
 print("Select the operation to be performed:")
 print("1. Add an element to the list.")
@@ -7,28 +14,39 @@ print("3. Mark an element from the list.")
 print("4. Exit.")
 
 def add_element():
-    task = input("Enter the task: ")
-    todo_List.append({"task": task, "completed": False})
-    print("Task added.")
+    tasks = [t.strip() for t in input("Enter the task (separate several with ';'): ").split(";") if t.strip()]
+    if not tasks:
+        print("No task entered.")
+        return
+    store.add_many(tasks)
+    print("Task added." if len(tasks) == 1 else f"{len(tasks)} tasks added.")
 
 def show_list():
-    if not todo_List:
+    choice = input("Show (a)ll, (p)ending or (c)ompleted tasks? [a]: ").strip().lower()
+    status = {"p": "pending", "c": "completed"}.get(choice[:1])
+    total = store.count(status)
+    if not total:
         print("The list is empty!")
-    else:
-        print("\nYour To-Do List:")
-        for i, item in enumerate(todo_List, start=1):
-            status = "Completed" if item["completed"] else "Pending"
-            print(f"{i}. [{status}] {item['task']}")
+        return
+    print(f"\nYour To-Do List ({total} tasks):")
+    # One page at a time, continuing after the last id shown
+    last_id = 0
+    while True:
+        page = store.page(status, after_id=last_id, limit=PAGE_SIZE)
+        for item in page:
+            status_text = "Completed" if item.completed else "Pending"
+            print(f"{item.id}. [{status_text}] {item.task}")
+        if len(page) < PAGE_SIZE:
+            break
+        last_id = page[-1].id
+        if input("Press Enter for more, or q to stop: ").strip().lower() == "q":
+            break
 
 
 def mark_element():
-    show_list()
-    if not todo_List:
-        return
     try:
-        index = int(input("Enter the task number to mark as completed: "))
-        if 1 <= index <= len(todo_List):
-            todo_List[index - 1]["completed"] = True
+        task_id = int(input("Enter the task number to mark as completed: "))
+        if store.mark(task_id):
             print("Task marked as completed!")
         else:
             print("Invalid task number.")
@@ -45,6 +63,7 @@ while True:
     elif choice == '3':
         mark_element()
     elif choice == '4':
+        store.close()
         print("Exiting... Goodbye!")
         break
     else:
@@ -1,16 +1,33 @@
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.generation import add_batch_arguments, run_batch
+from common.hf_backends import add_backend_argument
+from common.model_host import add_host_arguments, get_model, run_host
 
 PROMPT = "Explain how rainbows are formed"
 MODEL = "google/flan-t5-large"  # large model, runs locally
 
 def main():
-    tokenizer = AutoTokenizer.from_pretrained(MODEL)
-    model = AutoModelForSeq2SeqLM.from_pretrained(MODEL)
+    parser = argparse.ArgumentParser()
+    add_backend_argument(parser)
+    add_host_arguments(parser)
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    tokenizer, model = get_model("seq2seq", MODEL, args.backend)
+
+    def answer(prompt):
+        inputs = tokenizer(prompt, return_tensors="pt")
+        outputs = model.generate(**inputs, max_new_tokens=150)
+        return tokenizer.decode(outputs[0], skip_special_tokens=True)
 
-    inputs = tokenizer(PROMPT, return_tensors="pt")
-    outputs = model.generate(**inputs, max_new_tokens=150)
-    response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    print(response)
+    if run_batch(args, tokenizer, model, max_new_tokens=150):
+        return
+    if not run_host(args, answer):
+        print(answer(PROMPT))
 
 if __name__ == "__main__":
     main()
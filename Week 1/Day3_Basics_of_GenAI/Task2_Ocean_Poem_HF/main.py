@@ -1,22 +1,40 @@
 # pip install transformers torch --upgrade
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+# optional, for --backend onnx: pip install optimum[onnxruntime]
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.generation import add_batch_arguments, run_batch
+from common.hf_backends import add_backend_argument
+from common.model_host import add_host_arguments, get_model, run_host
 
 def main():
+    parser = argparse.ArgumentParser()
+    add_backend_argument(parser)
+    add_host_arguments(parser)
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
     prompt = "Write a small poem about the ocean"
     model_name = "google/flan-t5-base"   # Better quality than small, but not too heavy
 
-    # Load tokenizer and model
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    # Load tokenizer and model once (fp32, int8-quantized or ONNX Runtime)
+    tokenizer, model = get_model("seq2seq", model_name, args.backend)
 
-    # Encode the prompt
-    inputs = tokenizer(prompt, return_tensors="pt")
+    def write(prompt):
+        # Encode the prompt
+        inputs = tokenizer(prompt, return_tensors="pt")
 
-    # Generate text
-    outputs = model.generate(**inputs, max_new_tokens=100)
-    result = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        # Generate text
+        outputs = model.generate(**inputs, max_new_tokens=100)
+        return tokenizer.decode(outputs[0], skip_special_tokens=True)
 
-    print(result)
+    # --prompts runs a batch file; --repl / --serve keep the model loaded for many prompts
+    if run_batch(args, tokenizer, model, max_new_tokens=100):
+        return
+    if not run_host(args, write):
+        print(write(prompt))
 
 if __name__ == "__main__":
     main()
@@ -3,7 +3,12 @@
 from langchain_community.document_loaders import TextLoader, PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-def load_and_split(file_path):
+def load_and_split(file_path, stream=False):
+    if stream:
+        # Lazy generator for large files; see streaming_loader.py for the multi-file pool
+        from streaming_loader import iter_chunks
+        return iter_chunks(file_path)
+
     if file_path.endswith(".txt"):
         loader = TextLoader(file_path, encoding="utf-8")
     elif file_path.endswith(".pdf"):
@@ -0,0 +1,147 @@
+# pip install langchain langchain-community pypdf
+"""Streaming, multi-process chunking for large .txt/.pdf corpora.
+
+Chunks are produced lazily: PDFs page by page, text files in fixed-size
+character windows. The unfinished tail of each text window is carried into the
+next one, so no chunk is cut at a window edge and consecutive chunks keep their
+overlap, while memory stays flat regardless of file size.
+
+    python streaming_loader.py policies/*.pdf --workers 8 --out chunks/
+    python streaming_loader.py --synthetic 16 --pages 400 --workers 4
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+WINDOW_CHARS = 1 << 20  # 1M characters of text in memory at a time
+PAGE_BREAK = "\f"  # form feed, as written by pdftotext and friends
+
+
+def make_splitter():
+    return RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, add_start_index=True)
+
+
+def iter_text_chunks(file_path, window_chars=WINDOW_CHARS, stats=None):
+    splitter = make_splitter()
+    carry = ""
+    last = ""
+    with open(file_path, encoding="utf-8") as f:
+        while True:
+            block = f.read(window_chars)
+            if not block:
+                break
+            if stats is not None:
+                stats["pages"] += block.count(PAGE_BREAK)
+            last = block[-1]
+            text = carry + block
+            docs = splitter.create_documents([text])
+            # The last chunk may be cut by the window edge; re-split it with the next window.
+            # Carry the raw text from its start so whitespace at the edge is kept.
+            for d in docs[:-1]:
+                yield Document(page_content=d.page_content, metadata={"source": file_path})
+            carry = text[docs[-1].metadata["start_index"]:] if docs else ""
+    if carry.strip():
+        for d in splitter.create_documents([carry]):
+            yield Document(page_content=d.page_content, metadata={"source": file_path})
+    if stats is not None and last and last != PAGE_BREAK:
+        stats["pages"] += 1  # final page without a trailing break
+
+
+def iter_pdf_chunks(file_path, stats=None):
+    splitter = make_splitter()
+    for page in PyPDFLoader(file_path).lazy_load():
+        if stats is not None:
+            stats["pages"] += 1
+        for d in splitter.split_documents([page]):
+            d.metadata.pop("start_index", None)
+            yield d
+
+
+def iter_chunks(file_path, stats=None):
+    """Lazily yield chunks of a .txt or .pdf file."""
+    if file_path.endswith(".txt"):
+        return iter_text_chunks(file_path, stats=stats)
+    if file_path.endswith(".pdf"):
+        return iter_pdf_chunks(file_path, stats=stats)
+    raise ValueError("Unsupported file type. Use .txt or .pdf")
+
+
+def _ingest_file(job):
+    file_path, out_dir = job
+    stats = {"file": file_path, "pages": 0, "chunks": 0}
+    sink = open(Path(out_dir) / (Path(file_path).name + ".jsonl"), "w", encoding="utf-8") if out_dir else None
+    try:
+        for doc in iter_chunks(file_path, stats):
+            stats["chunks"] += 1
+            if sink:
+                sink.write(json.dumps({"text": doc.page_content, "metadata": doc.metadata}, ensure_ascii=False) + "\n")
+    finally:
+        if sink:
+            sink.close()
+    stats["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return stats
+
+
+def ingest_files(paths, workers, out_dir=None):
+    """Chunk many files across a process pool; yields per-file stats as files finish."""
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with get_context("spawn").Pool(workers) as pool:
+        yield from pool.imap_unordered(_ingest_file, [(p, out_dir) for p in paths])
+
+
+def make_synthetic_corpus(directory, files, pages, chars_per_page=3000):
+    words = "policy coverage claim premium hospital employee salary deduction benefit period".split()
+    paths = []
+    for i in range(files):
+        path = Path(directory) / f"synthetic_{i}.txt"
+        with open(path, "w", encoding="utf-8") as f:
+            for _ in range(pages):
+                page, size = [], 0
+                while size < chars_per_page:
+                    sentence = " ".join(random.choices(words, k=12)).capitalize() + ". "
+                    page.append(sentence)
+                    size += len(sentence)
+                f.write("".join(page).rstrip() + "\n" + PAGE_BREAK)
+        paths.append(str(path))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", help="directory for one chunks JSONL per input file")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="benchmark on N generated text files")
+    parser.add_argument("--pages", type=int, default=400, help="pages per synthetic file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_synthetic_corpus(tmp, args.synthetic, args.pages) if args.synthetic else args.files
+        start = time.perf_counter()
+        pages = chunks = 0
+        peak = 0.0
+        for stats in ingest_files(paths, args.workers, args.out):
+            pages += stats["pages"]
+            chunks += stats["chunks"]
+            peak = max(peak, stats["peak_rss_mb"])
+        elapsed = time.perf_counter() - start
+
+    print(f"{len(paths)} files, {pages} pages, {chunks} chunks in {elapsed:.2f}s")
+    print(f"{pages / elapsed:.1f} pages/sec, peak worker RSS {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Push a JSONL file of prompts through Bedrock concurrently.
+
+Input lines look like {"id": "q1", "prompt": "..."} (id defaults to the line
+number). Results are appended to the output JSONL as they finish, so a rerun
+skips every id already there; failures go to <output>.errors.jsonl and are
+retried on the next run.
+
+    python batch_runner.py prompts.jsonl results.jsonl --workers 16 --rps 5
+    python batch_runner.py prompts.jsonl results.jsonl --stream
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from botocore.exceptions import ClientError, ConnectionClosedError, EndpointConnectionError, ReadTimeoutError
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.llm_gateway import BedrockProvider, LLMGateway
+
+from main import make_request
+
+# Lower-cased: invoke_model raises "ThrottlingException", but a throttle that arrives
+# mid-stream is an EventStreamError spelled "throttlingException"
+THROTTLING_CODES = {
+    "throttlingexception",
+    "toomanyrequestsexception",
+    "serviceunavailableexception",
+    "modelnotreadyexception",
+}
+
+
+# Transient network failures: retried, but not a reason to slow down
+NETWORK_ERRORS = (ConnectionClosedError, EndpointConnectionError, ReadTimeoutError)
+
+
+def is_throttle(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code", "").lower() in THROTTLING_CODES
+
+
+class AdaptiveRateLimiter:
+    """Shared request pacing: halves the rate on throttling, creeps back up on success."""
+
+    def __init__(self, rps: float, min_rps: float = 0.2, max_rps: float = 50.0, step: float = 0.1):
+        self.rps = rps
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.step = step
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1 / self.rps
+        time.sleep(max(0.0, slot - now))
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rps = min(self.max_rps, self.rps + self.step)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.rps = max(self.min_rps, self.rps / 2)
+
+
+def make_gateway(region: str, workers: int) -> LLMGateway:
+    # One client for all threads; the pool must be at least as large as the
+    # worker count or threads queue on connections. botocore's own retries are
+    # off: its standard mode also retries throttling, which would skip the
+    # adaptive limiter, so invoke_with_backoff() handles every retry.
+    gateway = LLMGateway()
+    gateway.register(BedrockProvider(region, max_connections=workers,
+                                     retries={"total_max_attempts": 1, "mode": "standard"}))
+    return gateway
+
+
+def invoke(gateway: LLMGateway, prompt: str, stream: bool = False) -> str:
+    request = make_request(prompt)
+    if not stream:
+        return gateway.complete("bedrock", request).text
+    return "".join(gateway.stream("bedrock", request))
+
+
+def invoke_with_backoff(gateway, limiter, prompt, stream=False, max_attempts=8, base=0.5, cap=30.0) -> str:
+    for attempt in range(max_attempts):
+        limiter.acquire()
+        try:
+            text = invoke(gateway, prompt, stream)
+            limiter.on_success()
+            return text
+        except ClientError as e:
+            if not is_throttle(e) or attempt == max_attempts - 1:
+                raise
+            limiter.on_throttle()
+        except NETWORK_ERRORS:
+            if attempt == max_attempts - 1:
+                raise
+        # Full jitter keeps retrying threads from stampeding together
+        time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+    raise RuntimeError("unreachable")
+
+
+def read_jobs(path: str):
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f):
+            if line.strip():
+                job = json.loads(line)
+                job.setdefault("id", n)
+                yield job
+
+
+def finished_ids(path: str) -> set:
+    """Ids already in the output; a line cut short by a killed run is skipped, so that job reruns."""
+    ids = set()
+    try:
+        with open(path, "rb+") as f:
+            for line in f:
+                try:
+                    ids.add(json.loads(line)["id"])
+                except (ValueError, KeyError):
+                    continue
+            # Terminate a truncated last line so the next record starts on its own line
+            if f.tell():
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+    except FileNotFoundError:
+        pass
+    return ids
+
+
+def run_batch(jobs, output: str, gateway: LLMGateway, workers: int = 8, rps: float = 5.0, stream: bool = False) -> dict:
+    done = finished_ids(output)
+    limiter = AdaptiveRateLimiter(rps)
+    lock = threading.Lock()
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    def work(job):
+        try:
+            record = {"id": job["id"], "generation": invoke_with_backoff(gateway, limiter, job["prompt"], stream)}
+            path, key = output, "ok"
+        except Exception as e:
+            record = {"id": job["id"], "error": str(e)}
+            path, key = output + ".errors.jsonl", "failed"
+        with lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            counts[key] += 1
+
+    # Fail before paying for any call if the output can't be written
+    open(output, "a", encoding="utf-8").close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        try:
+            for job in jobs:
+                if job["id"] in done:
+                    counts["skipped"] += 1
+                    continue
+                in_flight.add(pool.submit(work, job))
+                if len(in_flight) >= 2 * workers:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()  # a failed write stops the run
+            for future in wait(in_flight).done:
+                future.result()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    counts["seconds"] = round(time.perf_counter() - start, 2)
+    counts["final_rps"] = round(limiter.rps, 2)
+    counts["bedrock"] = gateway.snapshot()["bedrock"]
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL with a 'prompt' (and optional 'id') per line")
+    parser.add_argument("output", help="JSONL results; also the checkpoint for restarts")
+    parser.add_argument("--region", default="ap-south-1")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=5.0, help="starting request rate; adapts to throttling")
+    parser.add_argument("--stream", action="store_true", help="use invoke_model_with_response_stream")
+    args = parser.parse_args()
+
+    gateway = make_gateway(args.region, args.workers)
+    counts = run_batch(read_jobs(args.input), args.output, gateway, args.workers, args.rps, args.stream)
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
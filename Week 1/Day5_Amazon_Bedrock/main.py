@@ -1,24 +1,24 @@
-import boto3
-import json
+import sys
+from pathlib import Path
 
-# Initialize Bedrock Runtime client
-client = boto3.client("bedrock-runtime", region_name="ap-south-1")  # choose your region
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.llm_gateway import BedrockProvider, ChatRequest, LLMGateway
 
 model_id = "meta.llama3-8b-instruct-v1:0"
 
-body = json.dumps({
-    "prompt": "Explain how rainbows are formed",
-    "temperature": 0.5,
-    "top_p": 0.9,
-    "max_gen_len": 200
-})
-
-response = client.invoke_model(
-    modelId=model_id,
-    body=body,
-    accept="application/json",
-    contentType="application/json"
-)
-
-result = json.loads(response["body"].read())
-print(result["generation"] if "generation" in result else result)
+
+def make_request(prompt, temperature=0.5, max_gen_len=200):
+    return ChatRequest(model=model_id, messages=(("user", prompt),), temperature=temperature, max_tokens=max_gen_len)
+
+
+def main():
+    # Same gateway the other apps use; BedrockProvider wraps the bedrock-runtime client
+    gateway = LLMGateway()
+    gateway.register(BedrockProvider(region="ap-south-1"))  # choose your region
+
+    result = gateway.complete("bedrock", make_request("Explain how rainbows are formed"))
+    print(result.text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Batch sentiment scoring for large review files.
+
+Reads one text per line from a file (or stdin with "-"), scores them across a
+pool of worker processes and writes JSONL incrementally, in input order:
+
+    python batch_classify.py reviews.txt -o scores.jsonl --workers 4 --threads 2
+    cat reviews.txt | python batch_classify.py - > scores.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+
+import torch
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.hf_backends import add_backend_argument, load_classifier
+from model import MODEL_ID, decode
+
+_tokenizer = None
+_model = None
+_token_budget = 0
+_max_batch = 0
+_load_error = None
+
+
+def _init_worker(model_id, backend, threads, token_budget, max_batch):
+    global _tokenizer, _model, _token_budget, _max_batch, _load_error
+    # Each worker gets its own slice of the cores instead of all of them fighting for every core
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    try:
+        _tokenizer, _model = load_classifier(model_id, backend)
+    except Exception as e:
+        # Raising here would make the Pool respawn workers forever; fail the first task instead
+        _load_error = f"Could not load {model_id} ({backend}): {type(e).__name__}: {e}"
+    _token_budget = token_budget
+    _max_batch = max_batch
+
+
+def _batches(order, lengths):
+    # Texts arrive sorted by length, so each batch pads to a similar size;
+    # short texts pack into bigger batches under the same token budget
+    batch = []
+    for i in order:
+        longest = max(lengths[i], lengths[batch[0]] if batch else 0)
+        if batch and (len(batch) >= _max_batch or longest * (len(batch) + 1) > _token_budget):
+            yield batch
+            batch = []
+        batch.append(i)
+    if batch:
+        yield batch
+
+
+def _classify_block(texts):
+    if _load_error is not None:
+        raise RuntimeError(_load_error)
+    enc = _tokenizer(texts, truncation=True, max_length=512)
+    lengths = [len(ids) for ids in enc["input_ids"]]
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+    id2label = _model.config.id2label
+    results = [None] * len(texts)
+
+    with torch.inference_mode():
+        for batch in _batches(order, lengths):
+            features = _tokenizer.pad(
+                {"input_ids": [enc["input_ids"][i] for i in batch], "attention_mask": [enc["attention_mask"][i] for i in batch]},
+                return_tensors="pt",
+            )
+            labels, scores, probs = decode(_model(**features).logits, id2label)
+            for i, label, score, row in zip(batch, labels, scores, probs):
+                results[i] = {"label": label, "score": round(score, 4), "scores": [round(p, 4) for p in row]}
+    return results
+
+
+def read_blocks(stream, block_size):
+    lines = (line.strip() for line in stream)
+    texts = (line for line in lines if line)
+    while True:
+        block = list(islice(texts, block_size))
+        if not block:
+            return
+        yield block
+
+
+def classify_stream(blocks, backend, workers, threads, token_budget, max_batch):
+    """Yield (texts, results) per block, in input order, with a bounded number of blocks in flight."""
+    ctx = get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(MODEL_ID, backend, threads, token_budget, max_batch)) as pool:
+        pending = deque()
+        for block in blocks:
+            pending.append((block, pool.apply_async(_classify_block, (block,))))
+            if len(pending) >= 2 * workers:
+                texts, job = pending.popleft()
+                yield texts, job.get()
+        while pending:
+            texts, job = pending.popleft()
+            yield texts, job.get()
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="text file with one review per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="JSONL output path (default: stdout)")
+    parser.add_argument("--threads", type=int, default=2, help="torch threads per worker")
+    parser.add_argument("--workers", type=int, default=max(1, cores // 2), help="worker processes")
+    parser.add_argument("--block-size", type=int, default=1024, help="texts sent to a worker at a time")
+    parser.add_argument("--token-budget", type=int, default=8192, help="max padded tokens per batch")
+    parser.add_argument("--max-batch", type=int, default=64)
+    add_backend_argument(parser)
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    done = 0
+    start = time.perf_counter()
+    try:
+        blocks = read_blocks(source, args.block_size)
+        for texts, results in classify_stream(blocks, args.backend, args.workers, args.threads, args.token_budget, args.max_batch):
+            for text, result in zip(texts, results):
+                sink.write(json.dumps({"id": done, "text": text, **result}, ensure_ascii=False) + "\n")
+                done += 1
+            sink.flush()
+            elapsed = time.perf_counter() - start
+            print(f"\r{done:,} docs  {done / elapsed:,.1f} docs/sec", end="", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    print(f"\nScored {done:,} docs in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.1f} docs/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,79 @@
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-import torch
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.hf_backends import add_backend_argument
+from common.model_host import add_host_arguments, get_model, run_host
 
 MODEL_ID = "tabularisai/multilingual-sentiment-analysis"
 
+TEST_TEXTS = [
+    "I love this phone!",
+    "This is the worst service I have ever experienced.",
+    "The delivery was on time, nothing special.",
+    "Das Essen war fantastisch!",
+    "El producto llegó roto y nadie responde.",
+]
+
+
+def decode(logits, id2label):
+    """Labels, top scores and full per-class probabilities for a whole batch.
+
+    One softmax/max over the batch tensor and a single transfer to Python,
+    instead of per-row comparisons and .item() calls.
+    """
+    import torch
+
+    probs = torch.softmax(logits, dim=-1)
+    top, idx = probs.max(dim=-1)
+    labels = [id2label[i] for i in idx.tolist()]
+    return labels, top.tolist(), probs.tolist()
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    add_backend_argument(parser)
+    add_host_arguments(parser)
+    args = parser.parse_args()
+
+    # torch/transformers are imported here, not at module load, to keep startup fast
+    import torch
+    from transformers import pipeline
+
+    tokenizer, model = get_model("classifier", MODEL_ID, args.backend)
+
+    def classify(text):
+        enc = tokenizer([text], truncation=True, return_tensors="pt")
+        with torch.inference_mode():
+            labels, scores, _ = decode(model(**enc).logits, model.config.id2label)
+        return {"label": labels[0], "score": round(scores[0], 4)}
+
+    if run_host(args, classify):
+        return
+
     print("=== Using Transformers pipeline ===")
-    clf = pipeline("sentiment-analysis", model=MODEL_ID)
-    test_texts = [
-        "I love this phone!",
-        "This is the worst service I have ever experienced."
-    ]
-    results = clf(test_texts)
-    for t, r in zip(test_texts, results):
+    clf = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    results = clf(TEST_TEXTS)
+    for t, r in zip(TEST_TEXTS, results):
         print(f'"{t}" -> {r["label"]} (score={r["score"]:.4f})')
 
     print("\n=== Using tokenizer + model ===")
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
-    model = AutoModelForSequenceClassification.from_pretrained(MODEL_ID)
-
-    enc = tokenizer(test_texts, padding=True, truncation=True, return_tensors="pt")
-    with torch.no_grad():
+    enc = tokenizer(TEST_TEXTS, padding=True, truncation=True, return_tensors="pt")
+    with torch.inference_mode():
         outputs = model(**enc)
-        probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        labels = ["NEGATIVE", "POSITIVE"]
-        for i, t in enumerate(test_texts):
-            label = labels[int(probs[i][1] > probs[i][0])]
-            score = probs[i].max().item()
-            print(f'"{t}" -> {label} (score={score:.4f})')
+    labels, scores, probs = decode(outputs.logits, model.config.id2label)
+    for t, label, score in zip(TEST_TEXTS, labels, scores):
+        print(f'"{t}" -> {label} (score={score:.4f})')
+
+    # Both paths must agree on the fixed corpus
+    mismatches = [
+        t for t, r, label, score in zip(TEST_TEXTS, results, labels, scores)
+        if r["label"] != label or abs(r["score"] - score) > 1e-4
+    ]
+    if mismatches:
+        raise SystemExit(f"\nPipeline and manual decoding disagree on: {mismatches}")
+    print(f"\nPipeline and manual decoding agree on all {len(TEST_TEXTS)} texts.")
 
 if __name__ == "__main__":
     main()
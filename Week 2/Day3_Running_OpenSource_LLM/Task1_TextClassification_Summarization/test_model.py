@@ -0,0 +1,52 @@
+"""decode() must label and score exactly as the transformers pipeline does.
+
+Runs offline: fixed logits go through decode() and through the pipeline's own
+softmax postprocessing, on a tiny randomly initialised model built from config.
+
+    python -m pytest test_model.py
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from model import decode
+
+ID2LABEL = {0: "Very Negative", 1: "Negative", 2: "Neutral", 3: "Positive", 4: "Very Positive"}
+
+LOGITS = torch.tensor([
+    [-2.1, -0.3, 0.4, 1.8, 3.2],
+    [4.0, 1.5, -0.5, -1.9, -3.0],
+    [0.1, 0.2, 0.25, 0.15, 0.05],
+    [-1.0, 2.6, 2.5, -0.4, -2.2],
+    [12.0, -8.0, 0.0, 3.0, 11.9],
+])
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    config = transformers.DistilBertConfig(
+        vocab_size=32, dim=8, hidden_dim=16, n_layers=1, n_heads=2, num_labels=len(ID2LABEL), id2label=ID2LABEL,
+        label2id={v: k for k, v in ID2LABEL.items()},
+    )
+    model = transformers.DistilBertForSequenceClassification(config)
+    return transformers.TextClassificationPipeline(model=model, tokenizer=None)
+
+
+def test_decode_matches_pipeline(pipeline):
+    labels, scores, probs = decode(LOGITS, ID2LABEL)
+    softmax = transformers.pipelines.text_classification.ClassificationFunction.SOFTMAX
+    for row, label, score in zip(LOGITS, labels, scores):
+        expected = pipeline.postprocess({"logits": row[None]}, function_to_apply=softmax)
+        assert label == expected["label"]
+        assert score == pytest.approx(expected["score"], abs=1e-6)
+    assert len(probs) == len(LOGITS)
+    assert all(sum(p) == pytest.approx(1.0, abs=1e-6) for p in probs)
+
+
+def test_decode_batch_matches_rows():
+    labels, scores, _ = decode(LOGITS, ID2LABEL)
+    for i, row in enumerate(LOGITS):
+        row_labels, row_scores, _ = decode(row[None], ID2LABEL)
+        assert row_labels == [labels[i]]
+        assert row_scores[0] == pytest.approx(scores[i])
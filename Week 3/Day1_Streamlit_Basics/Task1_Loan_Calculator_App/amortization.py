@@ -0,0 +1,131 @@
+"""Closed-form amortization schedules with NumPy.
+
+Within a stretch of months with a fixed rate and payment, the balance after
+k payments is  B0 * (1+r)^k - A * ((1+r)^k - 1) / r,  so each stretch is
+computed as whole arrays. Prepayments and rate changes only split the
+schedule into a few such stretches; there is no per-month Python loop.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Month", "Payment", "Principal", "Interest", "Balance"]
+
+# Balances below half a cent count as paid off (closed-form rounding noise)
+PAID_OFF = 0.005
+
+
+def pmt(P, r, n):
+    """Monthly payment; scalars or broadcastable arrays."""
+    P, r, n = np.asarray(P, dtype=float), np.asarray(r, dtype=float), np.asarray(n, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(r == 0, P / n, P * r / (1 - (1 + r) ** -n))
+    return out if out.ndim else float(out)
+
+
+def _stretch(balance: float, r: float, payment: float, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    k = np.arange(1, count + 1, dtype=float)
+    if r == 0:
+        end = balance - payment * k
+    else:
+        growth = (1 + r) ** k
+        end = balance * growth - payment * (growth - 1) / r
+    start = np.concatenate(([balance], end[:-1]))
+    return start, end
+
+
+def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    months: int,
+    prepayments: Iterable[Tuple[int, float]] = (),
+    rate_changes: Iterable[Tuple[int, float]] = (),
+) -> pd.DataFrame:
+    """Monthly schedule, rounded to cents like the UI shows it.
+
+    `prepayments` are (month, amount) lump sums paid on top of that month's
+    instalment; the payment stays the same and the loan ends earlier.
+    `rate_changes` are (month, annual_rate) pairs taking effect from that
+    month; the payment is re-amortized over the remaining term.
+    """
+    prepay: Dict[int, float] = {}
+    for m, amount in prepayments:
+        if 1 <= m <= months and amount > 0:
+            prepay[m] = prepay.get(m, 0.0) + amount
+    changes = {m: rate for m, rate in rate_changes if 1 <= m <= months}
+
+    cuts = sorted({1, months + 1} | set(changes) | {m + 1 for m in prepay if m < months})
+    r = annual_rate / 12
+    payment = pmt(principal, r, months)
+    balance = float(principal)
+    parts: List[np.ndarray] = []
+
+    for first, nxt in zip(cuts, cuts[1:]):
+        if first in changes:
+            r = changes[first] / 12
+            payment = pmt(balance, r, months - first + 1)
+
+        start, end = _stretch(balance, r, payment, nxt - first)
+        interest = start * r
+        paid = np.full_like(start, payment)
+        last = nxt - 1
+        if last in prepay:
+            end[-1] -= prepay[last]
+            paid[-1] += prepay[last]
+
+        done = np.flatnonzero(end < PAID_OFF)
+        if done.size:
+            # Final instalment only clears what is left
+            i = done[0]
+            start, end, interest, paid = start[: i + 1], end[: i + 1], interest[: i + 1], paid[: i + 1]
+            paid[-1] = start[-1] + interest[-1]
+            end[-1] = 0.0
+
+        month = np.arange(first, first + len(start))
+        parts.append(np.column_stack([month, paid, paid - interest, interest, np.maximum(end, 0.0)]))
+        balance = float(end[-1])
+        if done.size:
+            break
+
+    schedule = pd.DataFrame(np.concatenate(parts), columns=COLUMNS).round(2)
+    schedule["Month"] = schedule["Month"].astype(int)
+    return schedule
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """Indices of a Largest-Triangle-Three-Buckets downsample of (x, y).
+
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean, which preserves the visual shape of a line chart.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[end:nxt_end].mean(), y[end:nxt_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def scenario_grid(price: float, annual_rates, years, deposits) -> Tuple[np.ndarray, np.ndarray]:
+    """Monthly payment and total interest for every (rate, years, deposit) combination.
+
+    One broadcast over pmt(); both arrays have shape (len(rates), len(years), len(deposits)).
+    """
+    r = np.asarray(annual_rates, dtype=float)[:, None, None] / 12
+    n = np.asarray(years, dtype=float)[None, :, None] * 12
+    P = price - np.asarray(deposits, dtype=float)[None, None, :]
+    payment = pmt(P, r, n)
+    return payment, payment * n - P
@@ -0,0 +1,52 @@
+"""Vectorized amortization vs the original per-month loop on 40-year loans.
+
+    python bench_amortization.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from amortization import amortization_schedule, pmt
+
+
+def loop_schedule(principal, annual_rate, months):
+    # The schedule as loan_calculator.py used to build it
+    r = annual_rate / 12
+    payment = pmt(principal, r, months)
+    balance = principal
+    rows = []
+    for i in range(1, months + 1):
+        interest = balance * r
+        principal_paid = payment - interest
+        balance -= principal_paid
+        rows.append([i, round(payment, 2), round(principal_paid, 2), round(interest, 2), round(max(balance, 0), 2)])
+    return pd.DataFrame(rows, columns=["Month", "Payment", "Principal", "Interest", "Balance"])
+
+
+def main():
+    months = 40 * 12
+    grid = [(p, rate) for p in np.linspace(100_000, 2_000_000, 10) for rate in np.linspace(0.01, 0.24, 24)]
+
+    for label, fn in [("python loop", loop_schedule), ("vectorized", amortization_schedule)]:
+        start = time.perf_counter()
+        for p, rate in grid:
+            fn(p, rate, months)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {len(grid)} schedules x {months} months: {elapsed:.3f} s ({elapsed / len(grid) * 1000:.2f} ms each)")
+
+    start = time.perf_counter()
+    for p, rate in grid:
+        amortization_schedule(p, rate, months, prepayments=[(60, 50_000), (120, 50_000)], rate_changes=[(36, rate + 0.01)])
+    elapsed = time.perf_counter() - start
+    print(f"{'with events':<12} {len(grid)} schedules x {months} months: {elapsed:.3f} s ({elapsed / len(grid) * 1000:.2f} ms each)")
+
+    worst = max(
+        (loop_schedule(p, rate, months) - amortization_schedule(p, rate, months)).abs().to_numpy().max()
+        for p, rate in grid[:20]
+    )
+    print(f"max abs difference vs loop (first 20 schedules): {worst:.2f}")
+
+
+if __name__ == "__main__":
+    main()
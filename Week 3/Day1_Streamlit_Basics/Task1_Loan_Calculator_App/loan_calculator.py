@@ -3,9 +3,51 @@ import pandas as pd
 import numpy as np
 import altair as alt
 
+from amortization import amortization_schedule, lttb, pmt, scenario_grid
+
 st.set_page_config(page_title="Loan Calculator", page_icon="💸", layout="wide")
 st.title("💸 Interactive Loan Calculator")
 
+mode = st.radio("Mode", ["Single loan", "Scenario sweep"], horizontal=True)
+
+# --- Scenario Sweep ---
+if mode == "Scenario sweep":
+    st.header("Scenario Sweep")
+    price = st.number_input("Asset Price", min_value=0.0, value=500000.0, step=50000.0)
+    c1, c2 = st.columns(2)
+    rate_range = c1.slider("Annual Interest Rate range (%)", 0.1, 24.0, (6.0, 12.0), 0.1)
+    rate_steps = c2.slider("Rate steps", 2, 100, 100)
+    year_range = c1.slider("Duration range (years)", 1, 40, (1, 40))
+    deposit_range = c1.slider("Deposit range", 0.0, float(price), (0.0, float(price) * 0.4), 10000.0)
+    deposit_steps = c2.slider("Deposit steps", 1, 50, 10)
+
+    rates = np.linspace(rate_range[0], rate_range[1], rate_steps) / 100
+    years_grid = np.arange(year_range[0], year_range[1] + 1)
+    deposits = np.linspace(deposit_range[0], deposit_range[1], deposit_steps)
+    payments, interest = scenario_grid(price, rates, years_grid, deposits)
+    st.caption(f"{payments.size:,} scenarios evaluated")
+
+    deposit = st.select_slider("Deposit shown in heatmaps", options=list(deposits), format_func=lambda d: f"₹ {d:,.0f}")
+    d = list(deposits).index(deposit)
+    rate_axis, year_axis = np.meshgrid(rates * 100, years_grid, indexing="ij")
+    grid = pd.DataFrame({
+        "Rate (%)": rate_axis.ravel().round(2),
+        "Years": year_axis.ravel(),
+        "Monthly Payment": payments[:, :, d].ravel().round(0),
+        "Total Interest": interest[:, :, d].ravel().round(0),
+    })
+
+    h1, h2 = st.columns(2)
+    for col, metric in ((h1, "Monthly Payment"), (h2, "Total Interest")):
+        heatmap = alt.Chart(grid).mark_rect().encode(
+            x="Years:O",
+            y=alt.Y("Rate (%):O", sort="descending"),
+            color=alt.Color(f"{metric}:Q", scale=alt.Scale(scheme="viridis")),
+            tooltip=["Rate (%)", "Years", metric]
+        ).properties(title=metric)
+        col.altair_chart(heatmap, use_container_width=True)
+    st.stop()
+
 # --- Inputs ---
 st.header("Borrower Details")
 name = st.text_input("Full name", placeholder="e.g., John Snow")
@@ -17,28 +59,30 @@ deposit = st.number_input("Deposit", min_value=0.0, value=100000.0, step=50000.0
 rate = st.slider("Annual Interest Rate (%)", 0.1, 24.0, 8.5, 0.1) / 100
 years = st.slider("Duration (years)", 1, 40, 20)
 
+with st.expander("Prepayment & rate change (optional)"):
+    c1, c2 = st.columns(2)
+    prepay_month = c1.number_input("Prepayment in month", min_value=0, max_value=years * 12, value=0, step=1, help="0 = no prepayment")
+    prepay_amount = c2.number_input("Prepayment amount", min_value=0.0, value=0.0, step=10000.0)
+    c3, c4 = st.columns(2)
+    change_month = c3.number_input("Rate changes in month", min_value=0, max_value=years * 12, value=0, step=1, help="0 = fixed rate")
+    new_rate = c4.slider("New annual rate (%)", 0.1, 24.0, rate * 100, 0.1) / 100
+
 # --- Loan Calculations ---
 principal = price - deposit
 n = years * 12  # monthly payments
 r = rate / 12  # monthly interest rate
 
-def pmt(P, r, n):
-    if r == 0:
-        return P / n
-    return P * r / (1 - (1 + r) ** -n)
-
 payment = pmt(principal, r, n)
 
 # --- Build Amortization Schedule ---
-balance = principal
-rows = []
-for i in range(1, n + 1):
-    interest = balance * r
-    principal_paid = payment - interest
-    balance -= principal_paid
-    rows.append([i, round(payment,2), round(principal_paid,2), round(interest,2), round(max(balance,0),2)])
+@st.cache_data(show_spinner=False)
+def build_schedule(principal, rate, n, prepayments, rate_changes):
+    # Cached on the loan inputs only, so reruns from other widgets (e.g. name) are free
+    return amortization_schedule(principal, rate, n, prepayments=prepayments, rate_changes=rate_changes)
 
-schedule = pd.DataFrame(rows, columns=["Month", "Payment", "Principal", "Interest", "Balance"])
+prepayments = ((prepay_month, prepay_amount),) if prepay_month and prepay_amount else ()
+rate_changes = ((change_month, new_rate),) if change_month else ()
+schedule = build_schedule(principal, rate, n, prepayments, rate_changes)
 
 # --- KPIs ---
 total_payment = schedule["Payment"].sum()
@@ -50,8 +94,12 @@ col2.metric("Monthly Payment", f"₹ {payment:,.0f}")
 col3.metric("Total Interest", f"₹ {total_interest:,.0f}")
 
 # --- Charts ---
+MAX_CHART_POINTS = 200
+
 st.subheader("📊 Loan Balance Over Time")
-chart1 = alt.Chart(schedule).mark_line().encode(
+# Only a shape-preserving sample goes into the chart spec sent to the browser
+chart_data = schedule.iloc[lttb(schedule["Month"], schedule["Balance"], MAX_CHART_POINTS)]
+chart1 = alt.Chart(chart_data).mark_line().encode(
     x="Month",
     y="Balance",
     tooltip=["Month", "Balance"]
@@ -60,7 +108,26 @@ st.altair_chart(chart1, use_container_width=True)
 
 # --- Dataframe + Download ---
 st.subheader("📋 Loan Payoff Schedule")
-st.dataframe(schedule, use_container_width=True)
+c1, c2 = st.columns(2)
+page_size = c1.selectbox("Rows per page", [12, 60, 120, 240], index=1)
+pages = max(1, -(-len(schedule) // page_size))
+page = c2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+st.dataframe(schedule.iloc[(page - 1) * page_size: page * page_size], use_container_width=True, hide_index=True)
+
+@st.cache_data(show_spinner=False)
+def export_schedule(principal, rate, n, prepayments, rate_changes, fmt):
+    # Serialized only on request, and cached by the same inputs as the schedule
+    data = build_schedule(principal, rate, n, prepayments, rate_changes)
+    if fmt == "Parquet":
+        return data.to_parquet(index=False)
+    return data.to_csv(index=False).encode("utf-8")
 
-csv = schedule.to_csv(index=False).encode("utf-8")
-st.download_button("⬇️ Download Schedule (CSV)", data=csv, file_name="amortization_schedule.csv", mime="text/csv")
+c1, c2 = st.columns(2)
+fmt = c1.radio("Export format", ["CSV", "Parquet"], horizontal=True)
+if c2.toggle("Prepare download"):
+    st.download_button(
+        f"⬇️ Download Schedule ({fmt})",
+        data=export_schedule(principal, rate, n, prepayments, rate_changes, fmt),
+        file_name=f"amortization_schedule.{fmt.lower()}",
+        mime="text/csv" if fmt == "CSV" else "application/vnd.apache.parquet",
+    )
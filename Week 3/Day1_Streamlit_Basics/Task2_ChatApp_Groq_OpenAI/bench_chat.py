@@ -0,0 +1,60 @@
+"""Offline load test of the chat completion loop against a fake OpenAI-compatible server.
+
+Each request is the next user turn in one of --concurrency ongoing
+conversations (each pre-filled with --history-turns earlier turns), streamed
+through the same ChatSession and gateway the app uses. History summaries are
+sent to the same server and counted:
+
+    python bench_chat.py --requests 500 --concurrency 32 --latency-ms 300 --save chat
+    python bench_chat.py --requests 500 --concurrency 32 --latency-ms 300 --baseline bench_results/chat-<stamp>.json
+"""
+import argparse
+import queue
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.chat_session import ChatSession, make_gateway
+from common.fake_openai_server import add_server_arguments, server_from_args
+from common.loadtest import add_load_arguments, report, run_load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_load_arguments(parser)
+    add_server_arguments(parser)
+    parser.add_argument("--history-turns", type=int, default=10)
+    parser.add_argument("--history-budget", type=int, default=4000)
+    args = parser.parse_args()
+
+    history = []
+    for i in range(args.history_turns):
+        history.append({"role": "user", "content": f"Question {i}: how is my bonus taxed this year? " * 4})
+        history.append({"role": "assistant", "content": f"Answer {i}: bonuses are taxed as regular income. " * 8})
+
+    with server_from_args(args) as server:
+        gateway = make_gateway("fake", base_url=server.base_url)
+
+        # One conversation per worker, so a conversation never has two turns in flight
+        sessions = queue.Queue()
+        for _ in range(args.concurrency):
+            sessions.put(ChatSession(gateway, "fake-model", system_prompt="You are a helpful assistant.",
+                                     history_budget=args.history_budget, messages=list(history)))
+
+        def call(i):
+            session = sessions.get()
+            try:
+                yield from session.stream(f"Follow-up question {i}")
+            finally:
+                sessions.put(session)
+
+        results = run_load(call, args.requests, args.concurrency, args.warmup)
+        results["gateway"] = gateway.snapshot()["openai"]
+        # Every request beyond the streamed turns is a history summary
+        results["summaries"] = results["gateway"]["requests"] - args.requests - args.warmup
+    report(results, args, vars(args))
+    print(f"  summaries   {results['summaries']} for {args.requests + args.warmup} turns")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 import os
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-from openai import OpenAI
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.chat_session import ChatSession, make_gateway
 
 st.set_page_config(page_title="LLM Chat • Streamlit + OpenAI", page_icon="💬", layout="centered")
 
@@ -26,6 +32,14 @@ model = st.sidebar.text_input(
 
 temperature = st.sidebar.slider("Temperature", 0.0, 2.0, 0.7, 0.1)
 max_tokens = st.sidebar.slider("Max tokens", 32, 4096, 1024, 32)
+history_budget = st.sidebar.slider(
+    "History budget (tokens)",
+    500,
+    16000,
+    4000,
+    500,
+    help="Older turns beyond this budget are folded into a running summary",
+)
 
 with st.sidebar.expander("System prompt", expanded=False):
     system_prompt = st.text_area(
@@ -42,24 +56,87 @@ with col1:
 if clear_chat:
     st.session_state.pop("messages", None)
     st.session_state.pop("last_response", None)
+    st.session_state.pop("context", None)
 
 # -----------------
 # Helpers
 # -----------------
 @st.cache_resource(show_spinner=False)
 def get_client(_api_key: str):
+    # One gateway per key: pooled connections and metrics shared by every session
     if not _api_key:
         return None
-    return OpenAI(api_key=_api_key)
-
-
-def init_session():
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    # Ensure we always start with a system message (not shown in UI)
-    has_system = any(m.get("role") == "system" for m in st.session_state.messages)
-    if not has_system and system_prompt:
-        st.session_state.messages.insert(0, {"role": "system", "content": system_prompt})
+    return make_gateway(_api_key)
+
+
+def get_session() -> ChatSession:
+    # Rebuilt every rerun around the persisted messages and context, so sidebar changes apply at once;
+    # ChatSession also inserts the system message (not shown in UI) if there is none yet
+    session = ChatSession(
+        client,
+        model,
+        system_prompt=system_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        history_budget=history_budget,
+        messages=st.session_state.setdefault("messages", []),
+        context=st.session_state.get("context"),
+    )
+    st.session_state.context = session.context
+    return session
+
+
+class BufferedStreamRenderer:
+    """Buffers streamed tokens and repaints the placeholder on a time/token budget.
+
+    Re-rendering the whole markdown on every chunk is quadratic in the answer
+    length; flushing every `interval` seconds or `flush_every` tokens keeps the
+    number of repaints bounded. Also records time-to-first-token and tokens/sec.
+    """
+
+    def __init__(self, area, interval: float = 0.05, flush_every: int = 64):
+        self.area = area
+        self.interval = interval
+        self.flush_every = flush_every
+        self.parts = []
+        self.pending = 0
+        self.start = time.perf_counter()
+        self.first_token_at = None
+        self.end = None
+        self.last_flush = self.start
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def add(self, token: str):
+        now = time.perf_counter()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        self.parts.append(token)
+        self.pending += 1
+        if self.pending >= self.flush_every or now - self.last_flush >= self.interval:
+            self.flush(now)
+
+    def flush(self, now=None):
+        self.area.markdown(self.text)
+        self.pending = 0
+        self.last_flush = now or time.perf_counter()
+
+    def finish(self) -> str:
+        self.end = time.perf_counter()
+        self.flush(self.end)
+        return self.text
+
+    def stats(self) -> dict:
+        if self.first_token_at is None:
+            return {"ttft_ms": None, "tokens": 0, "tokens_per_sec": None}
+        gen_time = (self.end or time.perf_counter()) - self.first_token_at
+        return {
+            "ttft_ms": (self.first_token_at - self.start) * 1000,
+            "tokens": len(self.parts),
+            "tokens_per_sec": len(self.parts) / gen_time if gen_time > 0 else None,
+        }
 
 
 def render_history():
@@ -82,46 +159,43 @@ if not api_key:
         "Enter your OpenAI API key in the sidebar to start chatting. On Streamlit Cloud, store it in Secrets as `OPENAI_API_KEY`."
     )
 
-init_session()
+if client:
+    with st.sidebar.expander("Gateway metrics", expanded=False):
+        st.json(client.snapshot())
+
+session = get_session()
 render_history()
 
 # Chat input
 prompt = st.chat_input("Type your message and hit Enter…")
 
 if prompt and client:
-    # Add user message to state and render
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    # Render the user message; the session adds it to the history
     with st.chat_message("user"):
         st.markdown(prompt)
 
     # Create streaming placeholder for assistant
     with st.chat_message("assistant"):
         stream_area = st.empty()
-        streamed_text = ""
+        renderer = BufferedStreamRenderer(stream_area)
 
         try:
-            # Call the Chat Completions API with streaming
-            stream = client.chat.completions.create(
-                model=model,
-                messages=[m for m in st.session_state.messages if m["role"] in {"system", "user", "assistant"}],
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stream=True,
-            )
-
-            # Stream chunks as they arrive
-            for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
-                    token = chunk.choices[0].delta.content
-                    streamed_text += token
-                    stream_area.markdown(streamed_text)
+            # Stream through the shared gateway; the session stores the reply once complete.
+            # Buffer tokens as they arrive; the renderer decides when to repaint
+            for token in session.stream(prompt):
+                renderer.add(token)
+            streamed_text = renderer.finish()
+
+            stats = renderer.stats()
+            st.session_state.last_response = stats
+            if stats["ttft_ms"] is not None:
+                st.caption(f"TTFT {stats['ttft_ms']:.0f} ms · {stats['tokens']} tokens · {stats['tokens_per_sec'] or 0:.1f} tok/s")
 
         except Exception as e:
             streamed_text = f"⚠️ Error: {e}"
             stream_area.markdown(streamed_text)
-
-        # Persist assistant response
-        st.session_state.messages.append({"role": "assistant", "content": streamed_text})
+            # Persist the error as the assistant's turn, as a successful reply would be
+            st.session_state.messages.append({"role": "assistant", "content": streamed_text})
 
 elif prompt and not client:
     st.warning("Please provide a valid OpenAI API key to send messages.")
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def context_key(snippets: Sequence[str]) -> str:
+    return hashlib.sha1("\0".join(snippets).encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    """Answers keyed by (agent, query embedding, retrieved-context hash).
+
+    A lookup hits when an entry for the same agent and context has a query
+    vector with cosine similarity >= `threshold` and is younger than `ttl`
+    seconds. The least recently used entry is evicted past `max_entries`.
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl: float = 600.0, max_entries: int = 512):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def get(self, agent: str, query_vector: Sequence[float], context: str) -> Optional[Any]:
+        q = self._normalize(query_vector)
+        now = time.monotonic()
+        with self._lock:
+            expired = [i for i, e in self._entries.items() if now - e[3] > self.ttl]
+            for i in expired:
+                del self._entries[i]
+
+            ids: List[int] = []
+            vectors: List[np.ndarray] = []
+            for i, (a, v, c, _, _) in self._entries.items():
+                if a == agent and c == context:
+                    ids.append(i)
+                    vectors.append(v)
+            if vectors:
+                scores = np.stack(vectors) @ q
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self._entries.move_to_end(ids[best])
+                    self.hits += 1
+                    return self._entries[ids[best]][4]
+            self.misses += 1
+            return None
+
+    def put(self, agent: str, query_vector: Sequence[float], context: str, response: Any) -> None:
+        entry = (agent, self._normalize(query_vector), context, time.monotonic(), response)
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,99 @@
+"""Per-request latency of a fresh LLM client per query vs the app's pooled LLMGateway.
+
+Runs a local OpenAI-compatible stub server, so no API key or network is needed:
+
+    python bench_llm_clients.py --requests 200 --server-delay-ms 5
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from llm_clients import MAX_CONNECTIONS, GatewayLLM
+from common.llm_gateway import LLMGateway, OpenAICompatibleProvider
+
+COMPLETION = {
+    "id": "stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def start_stub_server(delay: float) -> ThreadingHTTPServer:
+    body = json.dumps(COMPLETION).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        # Headers and body are separate writes; with Nagle on, each response waits ~40 ms
+        # for the client's delayed ACK, which would swamp the connection setup being measured
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label: str, make_llm, requests: int) -> None:
+    messages = [("user", "ping")]
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        make_llm().invoke(messages)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:<26} mean={statistics.mean(latencies):7.2f} ms  p50={statistics.median(latencies):7.2f} ms  p95={p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--server-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.server_delay_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    common = dict(model="stub", temperature=0.2, api_key="stub", base_url=base_url)
+
+    # What get_llm() used to do: a new client, and so a new connection, per query
+    def fresh():
+        return ChatOpenAI(**common, http_client=httpx.Client())
+
+    # One client, but no idle connections kept: every query opens a new TCP connection
+    no_keepalive_llm = ChatOpenAI(**common, http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=0)))
+    # What get_llm() does now
+    gateway = LLMGateway()
+    gateway.register(OpenAICompatibleProvider("openai", api_key="stub", base_url=base_url,
+                                              max_connections=MAX_CONNECTIONS))
+    pooled_llm = GatewayLLM(gateway, "openai", "stub")
+
+    # fresh - new connection = building the client (mostly httpx's SSL context);
+    # new connection - pooled = TCP setup, which is larger with TLS to a remote API
+    run("fresh client per query", fresh, args.requests)
+    run("new connection per query", lambda: no_keepalive_llm, args.requests)
+    run("pooled gateway", lambda: pooled_llm, args.requests)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
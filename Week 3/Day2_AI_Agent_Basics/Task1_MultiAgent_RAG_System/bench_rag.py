@@ -0,0 +1,80 @@
+"""Offline load test of the Multi-Agent RAG pipeline against a fake OpenAI-compatible server.
+
+Drives rag_core.answer() exactly as the app does (routing, hybrid retrieval,
+answer cache, streaming single agents, fanned-out multi-agent queries), with
+the LLM replaced by common/fake_openai_server.py:
+
+    python bench_rag.py --requests 300 --concurrency 16 --latency-ms 300 --save rag
+    RAG_TRACING=1 python bench_rag.py --fake-embeddings --baseline bench_results/rag-<stamp>.json
+
+--fake-embeddings swaps MiniLM for deterministic hash embeddings, to measure
+the pipeline without the embedding model. --distinct sets how many different
+queries are sent; fewer distinct queries means more semantic-cache hits.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.fake_openai_server import add_server_arguments, server_from_args
+from common.loadtest import add_load_arguments, report, run_load
+
+QUERIES = [
+    "How is my monthly salary calculated?",
+    "What deductions like PF come out of my pay?",
+    "Is the annual bonus part of gross salary?",
+    "What does my insurance policy cover?",
+    "How do I file a cashless claim at a network hospital?",
+    "What is the premium for family coverage?",
+    "Is the insurance premium deducted from my salary?",
+    "What is the weather like today?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_load_arguments(parser)
+    add_server_arguments(parser)
+    parser.add_argument("--distinct", type=int, default=None, help="distinct queries (default: every request differs)")
+    parser.add_argument("--fake-embeddings", action="store_true", help="deterministic hash embeddings instead of MiniLM")
+    parser.add_argument("--no-stream", action="store_true", help="use the non-streaming agent path")
+    args = parser.parse_args()
+
+    with server_from_args(args) as server:
+        # Must be set before rag_core picks its LLM provider
+        os.environ["OPENAI_API_KEY"] = "fake"
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        import rag_core
+        import tracing
+        from llm_clients import get_gateway
+
+        if args.fake_embeddings:
+            from langchain_community.embeddings import DeterministicFakeEmbedding
+
+            retrievers, router = rag_core.init(base_embeddings=DeterministicFakeEmbedding(size=384),
+                                               model_name="fake-hash-384")
+        else:
+            retrievers, router = rag_core.init()
+
+        distinct = args.distinct or args.requests
+
+        def call(i):
+            j = i % distinct
+            query = f"{QUERIES[j % len(QUERIES)]} (case {j // len(QUERIES)})"
+            _, result, tokens = rag_core.answer(query, retrievers, router, stream=not args.no_stream)
+            return tokens if tokens is not None else iter([result.answer])
+
+        results = run_load(call, args.requests, args.concurrency, args.warmup)
+    results["answer_cache"] = rag_core.get_answer_cache().stats()
+    results["gateway"] = get_gateway().snapshot()
+    if tracing.ENABLED:
+        results["stages"] = tracing.METRICS.snapshot()
+    report(results, args, vars(args))
+    if tracing.ENABLED:
+        for stage, s in results["stages"].items():
+            print(f"  {stage:<16} n={s['count']:<5} p50={s['p50_ms']} p95={s['p95_ms']} p99={s['p99_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
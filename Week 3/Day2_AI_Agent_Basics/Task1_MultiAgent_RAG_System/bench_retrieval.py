@@ -0,0 +1,90 @@
+"""Recall@k and latency of the retrieval options on a synthetic corpus.
+
+Vectors are clustered random unit vectors and texts are Zipf-distributed words
+with a few rare per-document terms, so no embedding model is needed. Each
+query is a noisy copy of one document; "hit@k" counts how often that document
+comes back, and "ann recall@k" compares the ANN top-k with exact search.
+
+    python bench_retrieval.py --docs 100000 --queries 500
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from retrieval import BM25Index, HybridRetriever, build_ann_index
+
+
+def make_corpus(n_docs, dim, rng):
+    centers = rng.standard_normal((max(1, n_docs // 100), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n_docs)] + 0.6 * rng.standard_normal((n_docs, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+
+    vocab = np.array([f"w{i}" for i in range(20000)])
+    ranks = np.minimum(rng.zipf(1.3, size=(n_docs, 40)), len(vocab)) - 1
+    rare = rng.integers(0, 10 ** 6, size=(n_docs, 2))
+    texts = [" ".join(vocab[r]) + f" id{a} id{b}" for r, (a, b) in zip(ranks, rare)]
+    return vectors, texts
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(i) for i in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    k = args.k
+
+    vectors, texts = make_corpus(args.docs, args.dim, rng)
+    targets = rng.choice(args.docs, args.queries, replace=False)
+    q_vecs = vectors[targets] + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    faiss.normalize_L2(q_vecs)
+    # Queries share a handful of words and one rare term with their document
+    q_texts = [" ".join(texts[t].split()[:5] + [texts[t].split()[-1]]) for t in targets]
+
+    exact = build_ann_index(vectors, kind="flat")
+    _, truth = exact.search(q_vecs, k)
+
+    print(f"{args.docs:,} docs, {args.queries} queries, k={k}")
+    print(f"{'method':<30} {'ms/query':>9} {'ann recall@k':>13} {'hit@k':>7}")
+
+    def report(label, ids, ms):
+        ann = np.mean([len(set(row) & set(t)) / k for row, t in zip(ids, truth)])
+        hit = np.mean([t in row for row, t in zip(ids, targets)])
+        print(f"{label:<30} {ms:>9.3f} {ann:>13.3f} {hit:>7.3f}")
+
+    configs = [("flat", {"kind": "flat"})]
+    configs += [(f"hnsw efSearch={ef}", {"kind": "hnsw", "ef_search": ef}) for ef in (16, 64, 256)]
+    configs += [(f"ivf nprobe={p}", {"kind": "ivf", "nprobe": p}) for p in (1, 8, 32)]
+    for label, kwargs in configs:
+        start = time.perf_counter()
+        index = build_ann_index(vectors, **kwargs)
+        build_s = time.perf_counter() - start
+        ids, ms = timed(lambda i: index.search(q_vecs[i:i + 1], k)[1][0], range(args.queries))
+        report(f"{label} ({build_s:.0f}s build)", ids, ms)
+
+    bm25 = BM25Index(texts)
+    ids, ms = timed(lambda i: bm25.search(q_texts[i], k)[0], range(args.queries))
+    report("bm25", ids, ms)
+
+    docs = [Document(page_content=t, metadata={"i": i}) for i, t in enumerate(texts)]
+    for alpha in (0.5, 0.8):
+        hybrid = HybridRetriever(docs, vectors, embeddings=None, alpha=alpha, kind="hnsw", ef_search=64)
+        ids, ms = timed(
+            lambda i: [d.metadata["i"] for d in hybrid.search_by_vector(q_texts[i], q_vecs[i], k)], range(args.queries)
+        )
+        report(f"hybrid alpha={alpha}", ids, ms)
+
+
+if __name__ == "__main__":
+    main()
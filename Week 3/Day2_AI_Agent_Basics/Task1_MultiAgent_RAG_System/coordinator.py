@@ -0,0 +1,30 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Agents do blocking FAISS and HTTP work, so they run on a shared pool. It is
+# not the loop's default executor: asyncio.run() would otherwise wait for a
+# timed-out agent's thread to finish before returning.
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agent")
+
+
+async def _call(name: str, fn: Callable[[], Any], timeout: float):
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    try:
+        return name, await asyncio.wait_for(loop.run_in_executor(_EXECUTOR, ctx.run, fn), timeout)
+    except asyncio.TimeoutError:
+        return name, TimeoutError(f"no answer within {timeout:.0f}s")
+    except Exception as e:
+        return name, e
+
+
+async def gather_agents(calls: Dict[str, Callable[[], Any]], timeout: float) -> Dict[str, Any]:
+    """Run every call concurrently; each value is the call's result or the exception it raised."""
+    results = await asyncio.gather(*(_call(name, fn, timeout) for name, fn in calls.items()))
+    return dict(results)
+
+
+def fan_out(calls: Dict[str, Callable[[], Any]], timeout: float) -> Dict[str, Any]:
+    return asyncio.run(gather_agents(calls, timeout))
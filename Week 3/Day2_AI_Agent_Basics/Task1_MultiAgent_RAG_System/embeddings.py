@@ -0,0 +1,122 @@
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Query-side wrapper around another `Embeddings`.
+
+    Query vectors are memoized in a bounded LRU, optionally backed by an SQLite
+    file on disk that several processes (app replicas, benchmarks) can share.
+    Cache misses from concurrent sessions are collected by one
+    worker thread for up to `max_wait_ms` and encoded in a single batch.
+    Document embedding (ingest) goes straight to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        max_entries: int = 2048,
+        disk_path: Optional[str] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.inner = inner
+        self.max_entries = max_entries
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = self._open_disk(disk_path) if disk_path else None
+        self._pending: "queue.Queue[tuple]" = queue.Queue()
+        threading.Thread(target=self._batch_worker, name="embed-batcher", daemon=True).start()
+
+    @staticmethod
+    def _open_disk(path: str) -> sqlite3.Connection:
+        # WAL lets readers in other processes run alongside a writer; busy_timeout
+        # waits out the brief write lock instead of failing
+        conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+        return conn
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        text = " ".join(text.split())
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        vec = self._lookup(key)
+        if vec is not None:
+            return vec
+
+        fut: Future = Future()
+        self._pending.put((text, fut))
+        vec = fut.result()
+        self._store(key, vec)
+        return vec
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return vec
+            if self._disk is not None:
+                row = self._disk.execute("SELECT vec FROM vectors WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    vec = array("d", row[0]).tolist()
+                    self._remember(key, vec)
+                    self.hits += 1
+                    return vec
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, vec: List[float]) -> None:
+        with self._lock:
+            self._remember(key, vec)
+            if self._disk is not None:
+                # Another process may have stored the same query first; either copy will do
+                self._disk.execute(
+                    "INSERT OR IGNORE INTO vectors (key, vec) VALUES (?, ?)", (key, array("d", vec).tobytes())
+                )
+
+    def _remember(self, key: str, vec: List[float]) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _batch_worker(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = self.inner.embed_documents([text for text, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), vec in zip(batch, vectors):
+                fut.set_result(vec)
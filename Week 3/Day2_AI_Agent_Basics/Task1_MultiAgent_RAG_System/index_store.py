@@ -0,0 +1,87 @@
+import hashlib
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Optional, Tuple
+
+import faiss
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+# Each store lives in INDEX_DIR/<name>-<key>, where key hashes the embedding
+# model name. Switching models starts a fresh index and the old directory for
+# that name is removed once the new one is written.
+INDEX_DIR = Path(os.getenv("RAG_INDEX_DIR", Path(__file__).with_name(".index_cache")))
+
+
+def index_path(name: str, model_name: str) -> Path:
+    key = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+    return INDEX_DIR / f"{name}-{key}"
+
+
+def load_index(path: Path, embeddings: Embeddings) -> Optional[FAISS]:
+    if not (path / "index.faiss").exists():
+        return None
+    try:
+        # The pickle was written by us, so deserializing it is safe
+        return FAISS.load_local(str(path), embeddings, allow_dangerous_deserialization=True)
+    except Exception:
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+
+def save_index(name: str, store: FAISS, path: Path) -> None:
+    # Write to a temp dir and rename, so a crash never leaves a half-written index
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    store.save_local(str(tmp))
+    shutil.rmtree(path, ignore_errors=True)
+    tmp.rename(path)
+
+    for old in INDEX_DIR.glob(f"{name}-*"):
+        if old != path:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# The hybrid retriever's ANN graph and BM25 postings are saved inside the store's
+# directory. save_index() replaces that directory whenever ingest() changes the
+# chunks, so these files are dropped exactly when they go stale; the ANN file is
+# also keyed by its settings, so changing e.g. RAG_ANN_INDEX rebuilds just that.
+def _hybrid_paths(path: Path, ann_settings: dict) -> Tuple[Path, Path]:
+    key = hashlib.sha256(repr(sorted(ann_settings.items())).encode("utf-8")).hexdigest()[:12]
+    return path / f"ann-{key}.faiss", path / "bm25.pkl"
+
+
+def load_hybrid(path: Path, ann_settings: dict):
+    """(ANN index or None, BM25 index or None) saved for this store."""
+    ann_file, bm25_file = _hybrid_paths(path, ann_settings)
+    index = bm25 = None
+    try:
+        if ann_file.exists():
+            index = faiss.read_index(str(ann_file))
+        if bm25_file.exists():
+            # Written by save_hybrid below, so unpickling it is safe
+            with open(bm25_file, "rb") as f:
+                bm25 = pickle.load(f)
+    except Exception:
+        return None, None
+    return index, bm25
+
+
+def save_hybrid(path: Path, ann_settings: dict, index, bm25) -> None:
+    if not path.is_dir():
+        return
+    ann_file, bm25_file = _hybrid_paths(path, ann_settings)
+    # Temp file and rename, as in save_index; other processes may be loading
+    tmp = ann_file.with_name(f"{ann_file.name}.{os.getpid()}.tmp")
+    faiss.write_index(index, str(tmp))
+    os.replace(tmp, ann_file)
+    for old in path.glob("ann-*.faiss"):
+        if old != ann_file:
+            old.unlink(missing_ok=True)
+    tmp = bm25_file.with_name(f"{bm25_file.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(bm25, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, bm25_file)
@@ -0,0 +1,58 @@
+import hashlib
+from typing import Dict, List
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from index_store import index_path, load_index, save_index
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+
+def chunk_id(doc: Document) -> str:
+    h = hashlib.sha256(doc.metadata.get("source", "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(doc.page_content.encode("utf-8"))
+    return h.hexdigest()
+
+
+def split_source(text: str, topic: str, source: str) -> Dict[str, Document]:
+    docs = splitter.create_documents([text.strip()], metadatas=[{"topic": topic, "source": source}])
+    # Keyed by content hash, so identical chunks collapse into one entry
+    return {chunk_id(d): d for d in docs}
+
+
+def ingest(name: str, chunks: Dict[str, Document], embeddings: Embeddings, model_name: str) -> FAISS:
+    """Bring the persisted index for `name` in line with `chunks`.
+
+    Only chunks whose hash is not in the index yet are embedded, and chunks
+    that disappeared from the source are deleted from it.
+    """
+    if not chunks:
+        raise ValueError(f"No content to index for '{name}'")
+
+    path = index_path(name, model_name)
+    store = load_index(path, embeddings)
+    if store is None:
+        ids = list(chunks)
+        store = FAISS.from_documents([chunks[i] for i in ids], embeddings, ids=ids)
+        save_index(name, store, path)
+        return store
+
+    indexed = set(store.index_to_docstore_id.values())
+    added: List[str] = [i for i in chunks if i not in indexed]
+    removed: List[str] = [i for i in indexed if i not in chunks]
+    if not added and not removed:
+        return store
+
+    if added:
+        store.add_documents([chunks[i] for i in added], ids=added)
+    if removed:
+        store.delete(removed)
+    save_index(name, store, path)
+    return store
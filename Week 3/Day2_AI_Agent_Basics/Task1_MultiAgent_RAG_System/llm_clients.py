@@ -0,0 +1,78 @@
+import importlib.util
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))  # repo root, for common/
+from common.llm_gateway import ChatRequest, ChatResult, LLMGateway, OpenAICompatibleProvider
+
+# Both providers speak the OpenAI API, through the openai SDK
+OPENAI_READY = importlib.util.find_spec("openai") is not None
+
+PROVIDER_LABELS = {"openai": "OpenAI", "groq": "Groq"}
+
+# provider: (API key variable, base URL, model); OpenAI's base URL comes from
+# OPENAI_BASE_URL when set (e.g. common/fake_openai_server.py)
+PROVIDERS = {
+    "openai": ("OPENAI_API_KEY", None, "gpt-4o-mini"),
+    "groq": ("GROQ_API_KEY", "https://api.groq.com/openai/v1", "llama-3.1-8b-instant"),
+}
+
+MAX_CONNECTIONS = 64
+
+
+@lru_cache(maxsize=1)
+def select_provider() -> Optional[Tuple[str, str]]:
+    """(provider, model) for the first configured provider, or None for fallback mode."""
+    if not OPENAI_READY:
+        return None
+    for provider, (key_var, _, model) in PROVIDERS.items():
+        if os.getenv(key_var):
+            return provider, model
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_gateway() -> LLMGateway:
+    """One gateway per process, so Streamlit sessions and reruns share its keep-alive pool."""
+    gateway = LLMGateway()
+    selected = select_provider()
+    if selected is not None:
+        provider = selected[0]
+        key_var, base_url, _ = PROVIDERS[provider]
+        gateway.register(OpenAICompatibleProvider(provider, api_key=os.getenv(key_var), base_url=base_url,
+                                                  max_connections=MAX_CONNECTIONS))
+    return gateway
+
+
+class GatewayLLM:
+    """A provider and model on an LLMGateway, called with (role, content) messages."""
+
+    def __init__(self, gateway: LLMGateway, provider: str, model: str, temperature: float = 0.2,
+                 max_tokens: int = 512):
+        self.gateway = gateway
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    def _request(self, messages: List[Tuple[str, str]]) -> ChatRequest:
+        return ChatRequest(model=self.model, messages=tuple(messages), temperature=self.temperature,
+                           max_tokens=self.max_tokens)
+
+    def invoke(self, messages: List[Tuple[str, str]]) -> ChatResult:
+        return self.gateway.complete(self.provider, self._request(messages))
+
+    def stream(self, messages: List[Tuple[str, str]]) -> Iterator[str]:
+        return self.gateway.stream(self.provider, self._request(messages))
+
+
+@lru_cache(maxsize=None)
+def get_llm(temperature: float = 0.2) -> Optional[GatewayLLM]:
+    selected = select_provider()
+    if selected is None:
+        return None
+    provider, model = selected
+    return GatewayLLM(get_gateway(), provider, model, temperature)
@@ -0,0 +1,314 @@
+"""Retrieval, agents and coordination for the Multi-Agent RAG app, without any UI.
+
+main.py renders this in Streamlit; bench_rag.py drives it headlessly.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from answer_cache import SemanticCache, context_key
+from coordinator import fan_out
+from embeddings import CachedEmbeddings
+from index_store import INDEX_DIR, index_path
+from ingest import ingest, split_source
+from llm_clients import get_llm
+from retrieval import HybridRetriever, load_reranker
+import tracing
+from router import QueryRouter
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# salary.txt and insurance.txt live at the repo root; RAG_DATA_DIR points elsewhere
+DATA_DIR = Path(os.getenv("RAG_DATA_DIR", Path(__file__).resolve().parents[3]))
+
+# Retrieval: "hnsw", "ivf" or "flat"; alpha weighs vector ranks against BM25 ranks
+ANN_INDEX = os.getenv("RAG_ANN_INDEX", "hnsw")
+HYBRID_ALPHA = float(os.getenv("RAG_HYBRID_ALPHA", "0.5"))
+RERANK = os.getenv("RAG_RERANK") == "1"
+
+
+# ---------------------------
+# Load Data (one source file per agent, e.g. salary.txt, insurance.txt)
+# ---------------------------
+def load_data() -> Dict[str, str]:
+    texts = {}
+    for spec in AGENT_SPECS.values():
+        with open(DATA_DIR / spec.source, encoding="utf-8") as f:
+            texts[spec.name] = f.read()
+    return texts
+
+
+def build_vectorstores(
+    texts: Dict[str, str], base_embeddings=None, model_name: str = EMBEDDING_MODEL
+) -> Dict[str, FAISS]:
+    # Query vectors are cached in memory and on disk, and concurrent misses share one encode() call
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    embeddings = CachedEmbeddings(
+        base_embeddings or HuggingFaceEmbeddings(model_name=model_name),
+        disk_path=str(index_path("query_vectors", model_name).with_suffix(".sqlite")),
+    )
+    stores = {}
+    for name, text in texts.items():
+        chunks = split_source(text, topic=name, source=AGENT_SPECS[name].source)
+        # Reuses the on-disk index and only embeds chunks that changed since the last run
+        stores[name] = ingest(name, chunks, embeddings, model_name)
+    return stores
+
+
+# ---------------------------
+# Agent Response Wrapper
+# ---------------------------
+@dataclass
+class AgentResponse:
+    answer: str
+    sources: List[str]
+    retrieved_snippets: List[str]
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> SemanticCache:
+    return SemanticCache(threshold=0.95, ttl=600, max_entries=512)
+
+
+def build_retriever(store: FAISS, path: Optional[Path] = None) -> HybridRetriever:
+    # With the store's directory, the ANN and BM25 indexes saved there are reused
+    reranker = load_reranker() if RERANK else None
+    return HybridRetriever.from_store(store, path, alpha=HYBRID_ALPHA, reranker=reranker, kind=ANN_INDEX)
+
+
+def _retrieve(query: str, retriever: HybridRetriever, agent: str) -> Tuple[List[float], List[str], List[str]]:
+    # Embed once: the vector drives both retrieval and the semantic cache lookup
+    with tracing.span("embed", agent=agent):
+        query_vector = retriever.embeddings.embed_query(query)
+    with tracing.span("retrieve", agent=agent) as s:
+        docs = retriever.search_by_vector(query, query_vector, k=3)
+        s.set(chunks=len(docs))
+    retrieved_snippets = [d.page_content for d in docs]
+    sources = list({d.metadata.get("source", "unknown") for d in docs})
+    return query_vector, retrieved_snippets, sources
+
+
+def _fallback_answer(retrieved_snippets: List[str]) -> str:
+    context = "\n".join(retrieved_snippets)
+    return (
+        f"[Fallback Answer]\n"
+        f"Based on the retrieved notes:\n\n"
+        f"{context}\n\n"
+        f"Summary: I used the retrieved text above to answer your query."
+    )
+
+
+def _messages(query: str, system_instruction: str, retrieved_snippets: List[str]):
+    return [
+        ("system", system_instruction.strip()),
+        ("user", f"Question: {query}\n\nUse ONLY this context:\n{chr(10).join(retrieved_snippets)}")
+    ]
+
+
+def rag_answer(query: str, retriever: HybridRetriever, system_instruction: str, agent: str = "default", llm=None) -> AgentResponse:
+    query_vector, retrieved_snippets, sources = _retrieve(query, retriever, agent)
+
+    if llm is None:
+        with tracing.span("llm_client", agent=agent):
+            llm = get_llm()
+    if llm is None:
+        return AgentResponse(answer=_fallback_answer(retrieved_snippets), sources=sources, retrieved_snippets=retrieved_snippets)
+
+    cache = get_answer_cache()
+    ctx_key = context_key(retrieved_snippets)
+    with tracing.span("answer_cache", agent=agent) as s:
+        cached = cache.get(agent, query_vector, ctx_key)
+        s.set(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    with tracing.span("llm", agent=agent) as s:
+        result = llm.invoke(_messages(query, system_instruction, retrieved_snippets))
+        s.set(tokens=result.completion_tokens)
+    response = AgentResponse(answer=result.text, sources=sources, retrieved_snippets=retrieved_snippets)
+    cache.put(agent, query_vector, ctx_key, response)
+    return response
+
+
+def rag_answer_stream(
+    query: str, retriever: HybridRetriever, system_instruction: str, agent: str = "default", llm=None
+) -> Tuple[AgentResponse, Iterator[str]]:
+    """Retrieve now, generate lazily.
+
+    The returned response already carries sources and snippets; its `answer`
+    is filled in once the token iterator has been consumed.
+    """
+    query_vector, retrieved_snippets, sources = _retrieve(query, retriever, agent)
+    response = AgentResponse(answer="", sources=sources, retrieved_snippets=retrieved_snippets)
+    if llm is None:
+        with tracing.span("llm_client", agent=agent):
+            llm = get_llm()
+
+    def tokens() -> Iterator[str]:
+        if llm is None:
+            response.answer = _fallback_answer(retrieved_snippets)
+            yield response.answer
+            return
+
+        cache = get_answer_cache()
+        ctx_key = context_key(retrieved_snippets)
+        with tracing.span("answer_cache", agent=agent) as s:
+            cached = cache.get(agent, query_vector, ctx_key)
+            s.set(hit=cached is not None)
+        if cached is not None:
+            response.answer = cached.answer
+            yield cached.answer
+            return
+
+        parts = []
+        # The span includes time the caller spends rendering between tokens
+        with tracing.span("llm", agent=agent) as s:
+            start = time.perf_counter()
+            for token in llm.stream(_messages(query, system_instruction, retrieved_snippets)):
+                if not parts:
+                    tracing.observe("llm_first_token", time.perf_counter() - start)
+                parts.append(token)
+                yield token
+            s.set(tokens=len(parts))
+        response.answer = "".join(parts)
+        cache.put(agent, query_vector, ctx_key, response)
+
+    return response, tokens()
+
+
+SALARY_INSTRUCTION = """
+You are the Salary Agent. Answer ONLY salary-related questions using the salary context.
+If not about salary, say you don’t have that information.
+"""
+
+INSURANCE_INSTRUCTION = """
+You are the Insurance Agent. Answer ONLY insurance-related questions using the insurance context.
+If not about insurance, say you don’t have that information.
+"""
+
+
+def salary_agent(query: str, retriever: HybridRetriever, stream: bool = False):
+    if stream:
+        return rag_answer_stream(query, retriever, SALARY_INSTRUCTION, agent="salary")
+    return rag_answer(query, retriever, SALARY_INSTRUCTION, agent="salary")
+
+
+def insurance_agent(query: str, retriever: HybridRetriever, stream: bool = False):
+    if stream:
+        return rag_answer_stream(query, retriever, INSURANCE_INSTRUCTION, agent="insurance")
+    return rag_answer(query, retriever, INSURANCE_INSTRUCTION, agent="insurance")
+
+
+# ---------------------------
+# Coordinator
+# ---------------------------
+SALARY_KEYWORDS = ["salary", "monthly", "annual", "deduction", "bonus", "net pay", "gross", "pf"]
+INSURANCE_KEYWORDS = ["insurance", "coverage", "premium", "claim", "policy", "hospital", "cashless"]
+
+# Example phrasings that shape each agent's centroid for queries with no keyword hit
+SALARY_EXAMPLES = [
+    "How much is my take-home pay?",
+    "What is deducted from my paycheck?",
+    "How is tax withheld from my income?",
+]
+INSURANCE_EXAMPLES = [
+    "Am I covered if I need surgery?",
+    "How do I get reimbursed for medical bills?",
+    "Which hospitals are in the network?",
+]
+
+@dataclass(frozen=True)
+class AgentSpec:
+    name: str
+    fn: Callable
+    source: str  # corpus file in DATA_DIR
+    keywords: Sequence[str] = field(default_factory=tuple)
+    examples: Sequence[str] = field(default_factory=tuple)
+
+
+# The single agent registry: data loading, indexing, routing and dispatch all read it
+AGENT_SPECS: Dict[str, AgentSpec] = {}
+
+
+def register_agent(name: str, fn: Callable, source: str, keywords: Sequence[str] = (),
+                   examples: Sequence[str] = ()) -> AgentSpec:
+    spec = AGENT_SPECS[name] = AgentSpec(name, fn, source, tuple(keywords), tuple(examples))
+    return spec
+
+
+register_agent("salary", salary_agent, "salary.txt", SALARY_KEYWORDS, SALARY_EXAMPLES)
+register_agent("insurance", insurance_agent, "insurance.txt", INSURANCE_KEYWORDS, INSURANCE_EXAMPLES)
+
+
+def build_router(embeddings) -> QueryRouter:
+    router = QueryRouter(embeddings)
+    for spec in AGENT_SPECS.values():
+        router.register(spec.name, spec.keywords, spec.examples)
+    return router
+
+
+def route_query(user_query: str, router: QueryRouter) -> List[str]:
+    with tracing.span("route") as s:
+        routes = router.route(user_query)
+        s.set(routes=",".join(routes))
+    return routes
+
+
+def merge_responses(results: Dict[str, AgentResponse]) -> AgentResponse:
+    if len(results) == 1:
+        return next(iter(results.values()))
+    answer = "\n\n".join(f"**{name.title()} Agent:**\n{r.answer}" for name, r in results.items())
+    # dict.fromkeys keeps first-seen order while dropping duplicates
+    sources = list(dict.fromkeys(s for r in results.values() for s in r.sources))
+    snippets = list(dict.fromkeys(s for r in results.values() for s in r.retrieved_snippets))
+    return AgentResponse(answer=answer, sources=sources, retrieved_snippets=snippets)
+
+
+AGENT_TIMEOUT = 30.0
+
+
+def coordinate(query: str, routes: List[str], retrievers: Dict[str, HybridRetriever]) -> AgentResponse:
+    # All routed agents run at once, so latency is the slowest agent rather than the sum
+    outcomes = fan_out({name: partial(AGENT_SPECS[name].fn, query, retrievers[name]) for name in routes}, AGENT_TIMEOUT)
+    results = {}
+    for name, outcome in outcomes.items():
+        if isinstance(outcome, Exception):
+            outcome = AgentResponse(answer=f"⚠️ The {name} agent failed: {outcome}", sources=[], retrieved_snippets=[])
+        results[name] = outcome
+    return merge_responses(results)
+
+
+def init(texts: Optional[Dict[str, str]] = None, base_embeddings=None, model_name: str = EMBEDDING_MODEL):
+    """(retrievers by agent, router), from each agent's source file unless texts are given."""
+    stores = build_vectorstores(texts or load_data(), base_embeddings, model_name)
+    retrievers = {name: build_retriever(store, index_path(name, model_name)) for name, store in stores.items()}
+    return retrievers, build_router(next(iter(stores.values())).embeddings)
+
+
+def answer(query: str, retrievers: Dict[str, HybridRetriever], router: QueryRouter,
+           stream: bool = False) -> Tuple[List[str], AgentResponse, Optional[Iterator[str]]]:
+    """Route and answer one query: (routes, response, tokens).
+
+    A single routed agent can stream; `tokens` is then an iterator that fills
+    in `response.answer` once consumed. Otherwise `tokens` is None and the
+    answer is complete.
+    """
+    routes = route_query(query, router)
+    if len(routes) == 1:
+        agent = AGENT_SPECS[routes[0]].fn
+        if stream:
+            result, tokens = agent(query, retrievers[routes[0]], stream=True)
+            return routes, result, tokens
+        return routes, agent(query, retrievers[routes[0]]), None
+    if routes:
+        return routes, coordinate(query, routes, retrievers), None
+    return routes, AgentResponse(
+        answer=f"I can only handle questions about {' or '.join(AGENT_SPECS)}.",
+        sources=[],
+        retrieved_snippets=[]
+    ), None
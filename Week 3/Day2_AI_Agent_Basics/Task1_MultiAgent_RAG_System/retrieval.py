@@ -0,0 +1,160 @@
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from index_store import load_hybrid, save_hybrid
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of numpy postings (doc ids, term frequencies)."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings[term].append((doc_id, tf))
+
+        n = len(texts)
+        self.doc_len = np.asarray(lengths, dtype=np.float32)
+        self.avgdl = float(self.doc_len.mean()) if n else 0.0
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, entries in postings.items():
+            ids = np.fromiter((d for d, _ in entries), dtype=np.int64, count=len(entries))
+            tf = np.fromiter((t for _, t in entries), dtype=np.float32, count=len(entries))
+            idf = float(np.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5)))
+            self.postings[term] = (ids, tf, idf)
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.zeros(len(self.doc_len), dtype=np.float32)
+        for term in set(tokenize(query)):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            ids, tf, idf = entry
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[ids] / self.avgdl)
+            scores[ids] += idf * tf * (self.k1 + 1) / (tf + norm)
+        hits = np.flatnonzero(scores)
+        if hits.size > k:
+            hits = hits[np.argpartition(-scores[hits], k)[:k]]
+        order = hits[np.argsort(-scores[hits])]
+        return order, scores[order]
+
+
+# build_ann_index() settings that change the built index, so key its saved copy
+ANN_SETTINGS = ("kind", "m", "ef_search", "nlist", "nprobe")
+
+
+def build_ann_index(vectors: np.ndarray, kind: str = "hnsw", m: int = 32, ef_search: int = 64,
+                    nlist: int = 256, nprobe: int = 8) -> faiss.Index:
+    """Inner-product index over unit vectors: HNSW, IVF, or exact flat.
+
+    IVF needs enough vectors to train its centroids; smaller corpora use HNSW.
+    """
+    n, dim = vectors.shape
+    if kind == "ivf" and n >= 39 * nlist:
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = nprobe
+    elif kind in ("hnsw", "ivf"):
+        index = faiss.IndexHNSWFlat(dim, m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = ef_search
+    else:
+        index = faiss.IndexFlatIP(dim)
+    index.add(vectors)
+    return index
+
+
+@lru_cache(maxsize=None)
+def load_reranker(model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name)
+
+
+class HybridRetriever:
+    """BM25 + approximate vector search, fused with weighted reciprocal rank fusion.
+
+    Each side contributes `candidates` hits; fused scores are
+    alpha / (60 + vector rank) + (1 - alpha) / (60 + BM25 rank). An optional
+    cross-encoder re-scores the top `rerank_top` fused hits.
+    """
+
+    RRF_K = 60
+
+    def __init__(self, docs: List[Document], vectors: Optional[np.ndarray], embeddings: Embeddings,
+                 alpha: float = 0.5, candidates: int = 20, reranker=None, rerank_top: int = 10,
+                 index=None, bm25: Optional[BM25Index] = None, **index_kwargs):
+        self.docs = docs
+        self.embeddings = embeddings
+        self.alpha = alpha
+        self.candidates = candidates
+        self.reranker = reranker
+        self.rerank_top = rerank_top
+        # A prebuilt index / BM25 (e.g. loaded from disk) must cover `docs` in the same order
+        self.bm25 = bm25 or BM25Index([d.page_content for d in docs])
+        if index is None:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            faiss.normalize_L2(vectors)
+            index = build_ann_index(vectors, **index_kwargs)
+        self.index = index
+
+    @classmethod
+    def from_store(cls, store: FAISS, path: Optional[Path] = None, **kwargs) -> "HybridRetriever":
+        """Build over `store`; with `path` (the store's directory), reuse the indexes saved there."""
+        n = store.index.ntotal
+        docs = [store.docstore.search(store.index_to_docstore_id[i]) for i in range(n)]
+        ann_settings = {key: kwargs[key] for key in ANN_SETTINGS if key in kwargs}
+        index, bm25 = load_hybrid(path, ann_settings) if path is not None else (None, None)
+        if index is not None and index.ntotal != n:
+            index = None
+        if bm25 is not None and len(bm25.doc_len) != n:
+            bm25 = None
+        vectors = store.index.reconstruct_n(0, n) if index is None else None
+        retriever = cls(docs, vectors, store.embeddings, index=index, bm25=bm25, **kwargs)
+        if path is not None and (index is None or bm25 is None):
+            save_hybrid(path, ann_settings, retriever.index, retriever.bm25)
+        return retriever
+
+    def search_by_vector(self, query: str, query_vector: Sequence[float], k: int = 3) -> List[Document]:
+        q = np.asarray([query_vector], dtype=np.float32)
+        faiss.normalize_L2(q)
+        _, vec_ids = self.index.search(q, min(self.candidates, len(self.docs)))
+        lex_ids, _ = self.bm25.search(query, self.candidates)
+
+        fused: Dict[int, float] = defaultdict(float)
+        for rank, i in enumerate(i for i in vec_ids[0] if i >= 0):
+            fused[int(i)] += self.alpha / (self.RRF_K + rank)
+        for rank, i in enumerate(lex_ids):
+            fused[int(i)] += (1 - self.alpha) / (self.RRF_K + rank)
+        ranked = sorted(fused, key=fused.get, reverse=True)
+
+        if self.reranker is not None and ranked:
+            top = ranked[: self.rerank_top]
+            scores = self.reranker.predict([(query, self.docs[i].page_content) for i in top])
+            ranked = [top[j] for j in np.argsort(-np.asarray(scores))]
+        return [self.docs[i] for i in ranked[:k]]
+
+    def search(self, query: str, k: int = 3, query_vector: Optional[Sequence[float]] = None) -> List[Document]:
+        if query_vector is None:
+            query_vector = self.embeddings.embed_query(query)
+        return self.search_by_vector(query, query_vector, k)
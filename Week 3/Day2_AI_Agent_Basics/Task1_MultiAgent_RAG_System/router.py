@@ -0,0 +1,79 @@
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class QueryRouter:
+    """Routes a query to one or more registered agents.
+
+    Stage 1 is a single compiled regex over every agent's keywords, so the
+    cost of a scan does not grow with one `in` test per keyword. If no keyword
+    matches, stage 2 compares the query embedding with each agent's centroid
+    (mean of its keyword and example embeddings) in one matrix product, and
+    returns every agent scoring within `fanout_margin` of the best.
+    """
+
+    def __init__(self, embeddings: Embeddings, min_score: float = 0.3, fanout_margin: float = 0.05):
+        self.embeddings = embeddings
+        self.min_score = min_score
+        self.fanout_margin = fanout_margin
+        self._agents: Dict[str, List[str]] = {}
+        self._keyword_owner: Dict[str, List[str]] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._names: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, keywords: Sequence[str], examples: Sequence[str] = ()) -> None:
+        with self._lock:
+            self._agents[name] = [k.lower() for k in keywords] + list(examples)
+            for k in keywords:
+                owners = self._keyword_owner.setdefault(k.lower(), [])
+                if name not in owners:
+                    owners.append(name)
+            # Longest first so "net pay" wins over a shorter overlapping keyword;
+            # only the left edge is anchored so plurals like "premiums" still match
+            alternatives = sorted(self._keyword_owner, key=len, reverse=True)
+            self._pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, alternatives)) + ")")
+            self._centroids = None
+
+    def _ensure_centroids(self) -> None:
+        with self._lock:
+            if self._centroids is not None:
+                return
+            names = list(self._agents)
+            rows = []
+            for name in names:
+                vectors = np.asarray(self.embeddings.embed_documents(self._agents[name]), dtype=np.float32)
+                centroid = vectors.mean(axis=0)
+                rows.append(centroid / np.linalg.norm(centroid))
+            self._names = names
+            self._centroids = np.stack(rows)
+
+    def keyword_route(self, query: str) -> List[str]:
+        if self._pattern is None:
+            return []
+        hits = {m.group(0) for m in self._pattern.finditer(query.lower())}
+        matched = {owner for k in hits for owner in self._keyword_owner[k]}
+        return [name for name in self._agents if name in matched]
+
+    def scores(self, query: str) -> Dict[str, float]:
+        self._ensure_centroids()
+        q = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        sims = self._centroids @ (q / np.linalg.norm(q))
+        return dict(zip(self._names, sims.tolist()))
+
+    def route(self, query: str) -> List[str]:
+        hits = self.keyword_route(query)
+        if hits:
+            return hits
+
+        scores = self.scores(query)
+        best = max(scores.values(), default=0.0)
+        if best < self.min_score:
+            return []
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [name for name in ranked if scores[name] >= max(best - self.fanout_margin, self.min_score)]
@@ -0,0 +1,166 @@
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# Stage tracing is off unless RAG_TRACING=1; while off, span() hands back one
+# shared no-op object. RAG_METRICS_FILE also writes the histograms in Prometheus
+# text format after every answer (e.g. for node_exporter's textfile collector).
+ENABLED = os.getenv("RAG_TRACING") == "1"
+METRICS_FILE = os.getenv("RAG_METRICS_FILE")
+
+# Upper bounds in seconds, as in the Prometheus client's default buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Numeric span attributes that are summed into counters
+COUNTED = ("tokens", "chunks")
+
+
+class Histogram:
+    def __init__(self, window: int = 1000):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+        # Percentiles come from recent samples; buckets cover the whole run
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.recent)
+
+        def pct(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+        return {"count": self.count, "p50_ms": pct(0.5), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+
+
+class Metrics:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, attrs: Optional[dict] = None):
+        with self._lock:
+            self.histograms.setdefault(stage, Histogram()).observe(seconds)
+            for key, value in (attrs or {}).items():
+                if key in COUNTED:
+                    name = f"{stage}_{key}"
+                    self.counters[name] = self.counters.get(name, 0) + value
+                elif key == "error":
+                    name = f"{stage}_errors"
+                    self.counters[name] = self.counters.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: h.snapshot() for stage, h in self.histograms.items()}
+
+    def prometheus(self) -> str:
+        lines = [
+            "# HELP rag_stage_seconds Time spent in each RAG pipeline stage.",
+            "# TYPE rag_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS, h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'rag_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'rag_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'rag_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE rag_{name}_total counter")
+                lines.append(f"rag_{name}_total {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        # Write then rename, so a scraper never reads a half-written file
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+
+# Module-level, so it survives Streamlit reruns like the other process-wide state
+METRICS = Metrics()
+
+_trace: ContextVar[Optional[List["Span"]]] = ContextVar("rag_trace", default=None)
+
+
+class Span:
+    __slots__ = ("stage", "attrs", "start", "seconds")
+
+    def __init__(self, stage: str, attrs: dict):
+        self.stage = stage
+        self.attrs = attrs
+        self.seconds = 0.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        METRICS.observe(self.stage, self.seconds, self.attrs)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append(self)
+        return False
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage: str, **attrs):
+    """Time a `with` block as one pipeline stage; attach counts with .set()."""
+    if not ENABLED:
+        return _NOOP
+    return Span(stage, attrs)
+
+
+def observe(stage: str, seconds: float):
+    """Record a duration measured elsewhere, e.g. time to first token."""
+    if ENABLED:
+        METRICS.observe(stage, seconds)
+
+
+def start_trace() -> List[Span]:
+    """Collect the spans of the current request into a list.
+
+    The list lives in a contextvar, and coordinator.py copies the context into
+    agent threads, so fanned-out agents add to the same trace.
+    """
+    trace: List[Span] = []
+    if ENABLED:
+        _trace.set(trace)
+    return trace
+
+
+def flush():
+    if ENABLED and METRICS_FILE:
+        METRICS.dump(METRICS_FILE)
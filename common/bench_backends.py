@@ -0,0 +1,130 @@
+"""Compare fp32, int8 and ONNX backends: latency, throughput, peak RSS, agreement.
+
+Each backend runs in a fresh process so peak RSS is not polluted by the others:
+
+    python -m common.bench_backends --task seq2seq --model google/flan-t5-base
+    python -m common.bench_backends --task sentiment
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import statistics
+import time
+from queue import Empty
+
+from common.hf_backends import BACKENDS, load_classifier, load_seq2seq
+
+SEQ2SEQ_PROMPTS = [
+    "Explain how rainbows are formed",
+    "Write a small poem about the ocean",
+    "Translate to German: The weather is nice today.",
+    "What is the capital of France?",
+    "Summarize: The meeting was moved to Friday because the manager is travelling.",
+    "Give three tips for staying focused while studying.",
+    "Why is the sky blue?",
+    "Write a haiku about autumn leaves.",
+]
+SENTIMENT_TEXTS = [
+    "I love this phone!",
+    "This is the worst service I have ever experienced.",
+    "The delivery was on time, nothing special.",
+    "Das Essen war fantastisch!",
+    "El producto llegó roto y nadie responde.",
+    "Absolutely brilliant support team, thank you.",
+    "Meh. It works, I guess.",
+    "Never buying from here again.",
+]
+
+
+def _run(task, model_id, backend, max_new_tokens, repeats, queue):
+    import torch
+
+    start = time.perf_counter()
+    if task == "seq2seq":
+        tokenizer, model = load_seq2seq(model_id, backend)
+        items = SEQ2SEQ_PROMPTS
+    else:
+        tokenizer, model = load_classifier(model_id, backend)
+        items = SENTIMENT_TEXTS
+    load_s = time.perf_counter() - start
+
+    def infer(texts):
+        enc = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+        with torch.inference_mode():
+            if task == "seq2seq":
+                out = model.generate(**enc, max_new_tokens=max_new_tokens)
+                return tokenizer.batch_decode(out, skip_special_tokens=True)
+            return model(**enc).logits.argmax(dim=-1).tolist()
+
+    infer(items[:1])  # warm-up
+    latencies = []
+    outputs = []
+    for text in items:
+        t = time.perf_counter()
+        outputs.extend(infer([text]))
+        latencies.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for _ in range(repeats):
+        infer(items)
+    throughput = repeats * len(items) / (time.perf_counter() - t)
+
+    queue.put({
+        "backend": backend,
+        "load_s": load_s,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "throughput": throughput,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "outputs": outputs,
+    })
+
+
+def _collect(proc, queue):
+    """The child's result, or None if it exited without one (its traceback is on stderr)."""
+    # Not join() first: a child can't exit until the parent has read what it put on the queue
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            if not proc.is_alive():
+                try:
+                    return queue.get(timeout=1)
+                except Empty:
+                    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--task", choices=["seq2seq", "sentiment"], default="seq2seq")
+    parser.add_argument("--model", help="defaults to flan-t5-base / the sentiment model")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    model_id = args.model or ("google/flan-t5-base" if args.task == "seq2seq" else "tabularisai/multilingual-sentiment-analysis")
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in args.backends.split(","):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run, args=(args.task, model_id, backend, args.max_new_tokens, args.repeats, queue))
+        proc.start()
+        result = _collect(proc, queue)
+        proc.join()
+        if result is None:
+            print(f"{backend}: failed (exit code {proc.exitcode}), skipped")
+            continue
+        results.append(result)
+    if not results:
+        raise SystemExit("Every backend failed")
+
+    baseline = next((r["outputs"] for r in results if r["backend"] == "fp32"), results[0]["outputs"])
+    print(f"{model_id} ({args.task})")
+    print(f"{'backend':<8} {'load s':>7} {'p50 ms':>8} {'items/s':>8} {'peak RSS MB':>12} {'agree':>6}")
+    for r in results:
+        agree = sum(a == b for a, b in zip(r["outputs"], baseline)) / len(baseline)
+        print(f"{r['backend']:<8} {r['load_s']:>7.1f} {r['p50_ms']:>8.1f} {r['throughput']:>8.2f} {r['peak_rss_mb']:>12.0f} {agree:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
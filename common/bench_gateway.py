@@ -0,0 +1,47 @@
+"""Offline load test of the LLM gateway against the fake provider.
+
+Fires concurrent requests drawn from a small pool of distinct prompts, so
+coalescing shows up as fewer upstream calls than requests:
+
+    python -m common.bench_gateway --requests 500 --concurrency 50 --distinct 20
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.llm_gateway import ChatRequest, FakeProvider, LLMGateway
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=20, help="number of distinct prompts")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake upstream latency")
+    parser.add_argument("--stream", action="store_true", help="exercise the streaming path instead")
+    args = parser.parse_args()
+
+    gateway = LLMGateway()
+    fake = gateway.register(FakeProvider(latency=args.latency_ms / 1000))
+    prompts = [f"Question {i}: what is covered?" for i in range(args.distinct)]
+
+    def call(_):
+        request = ChatRequest(model="fake", messages=(("user", random.choice(prompts)),))
+        if args.stream:
+            return "".join(gateway.stream("fake", request))
+        return gateway.complete("fake", request).text
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s), "
+          f"{fake.calls} upstream calls")
+    print(json.dumps(gateway.snapshot()["fake"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Token-budgeted chat history with a rolling summary of older turns.
+
+Works on OpenAI-style message dicts ({"role": ..., "content": ...}), so any of
+the chat or RAG apps can pass their history through `ConversationContext.build`
+before calling a model.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+Message = Dict[str, str]
+Summarizer = Callable[[str, List[Message]], str]
+
+# Rough per-message overhead of the chat format (role markers, separators)
+MESSAGE_OVERHEAD = 4
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return max(1, len(text) // 4)
+
+
+def extractive_summary(summary: str, dropped: List[Message], max_chars: int = 2000) -> str:
+    """Fallback summarizer: keep the first line of each dropped turn."""
+    lines = [summary] if summary else []
+    for m in dropped:
+        first_line = m["content"].strip().splitlines()[0] if m["content"].strip() else ""
+        lines.append(f"- {m['role']}: {first_line[:200]}")
+    text = "\n".join(lines)
+    # Keep the most recent part when the summary outgrows its budget
+    return text[-max_chars:]
+
+
+class ConversationContext:
+    """Fits a message list into `budget` tokens.
+
+    System messages are always kept. While the history fits it is sent as is;
+    once it overflows, older turns are folded into a running summary (sent as an
+    extra system message) by `summarize(previous_summary, dropped_messages)`
+    until the rest fits in `low_water` of the space. The headroom this leaves
+    means a summary call happens every several turns rather than on every turn.
+    The summary itself is held to `summary_share` of the budget (its oldest text
+    is cut first), so it cannot crowd out the turns it makes room for.
+    Token counts are cached per message, so each turn only tokenizes new text.
+    """
+
+    def __init__(self, budget: int = 4000, summarize: Optional[Summarizer] = None, low_water: float = 0.5,
+                 summary_share: float = 0.25):
+        self.budget = budget
+        self.summarize = summarize or extractive_summary
+        self.low_water = low_water
+        self.summary_share = summary_share
+        self.summary = ""
+        self.summarized = 0  # number of user/assistant messages already in the summary
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def tokens(self, message: Message) -> int:
+        key = (message["role"], message["content"])
+        count = self._counts.get(key)
+        if count is None:
+            count = count_tokens(message["content"]) + MESSAGE_OVERHEAD
+            self._counts[key] = count
+        return count
+
+    @property
+    def summary_budget(self) -> int:
+        return int(self.budget * self.summary_share)
+
+    def _fit_summary(self, summary: str) -> str:
+        tokens = count_tokens(summary)
+        if tokens <= self.summary_budget:
+            return summary
+        return summary[-int(len(summary) * self.summary_budget / tokens):]
+
+    def _summary_message(self) -> List[Message]:
+        if not self.summary:
+            return []
+        return [{"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"}]
+
+    def build(self, messages: List[Message]) -> List[Message]:
+        system = [m for m in messages if m["role"] == "system"]
+        history = [m for m in messages if m["role"] in {"user", "assistant"}]
+        if self.summarized > len(history):
+            # History was cleared or replaced; start over
+            self.summary, self.summarized = "", 0
+
+        pending = history[self.summarized:]
+        available = self.budget - sum(self.tokens(m) for m in system + self._summary_message())
+        if sum(self.tokens(m) for m in pending) <= available:
+            return system + self._summary_message() + pending
+
+        # Over budget: compact down to the low-water mark, not just back under the limit
+        target = available * self.low_water
+        kept: List[Message] = []
+        used = 0
+        for m in reversed(pending):
+            t = self.tokens(m)
+            # Always keep the latest message, even if it alone is over budget
+            if kept and used + t > target:
+                break
+            kept.append(m)
+            used += t
+        kept.reverse()
+
+        dropped = pending[: len(pending) - len(kept)]
+        if dropped:
+            self.summary = self._fit_summary(self.summarize(self.summary, dropped))
+            self.summarized += len(dropped)
+            live = {(m["role"], m["content"]) for m in messages}
+            self._counts = {k: v for k, v in self._counts.items() if k in live}
+
+        return system + self._summary_message() + kept
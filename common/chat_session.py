@@ -0,0 +1,73 @@
+"""The chat app's completion loop, independent of Streamlit.
+
+A `ChatSession` owns one conversation: it keeps the message list, trims it to
+the history budget through `ConversationContext`, and streams replies through
+an `LLMGateway`. chatbot.py renders it; bench_chat.py drives it headlessly.
+"""
+from typing import Dict, Iterator, List, Optional
+
+from common.chat_context import ConversationContext, extractive_summary
+from common.llm_gateway import ChatRequest, LLMGateway, OpenAICompatibleProvider
+
+SUMMARY_INSTRUCTION = (
+    "Update the running summary of a conversation. Keep facts, names, decisions and open questions. "
+    "Reply with the summary only."
+)
+
+
+def make_gateway(api_key: str, base_url: Optional[str] = None, provider: str = "openai") -> LLMGateway:
+    gateway = LLMGateway()
+    gateway.register(OpenAICompatibleProvider(provider, api_key=api_key, base_url=base_url))
+    return gateway
+
+
+class ChatSession:
+    def __init__(self, gateway: Optional[LLMGateway], model: str, system_prompt: str = "",
+                 temperature: float = 0.7, max_tokens: int = 1024, history_budget: int = 4000,
+                 messages: Optional[List[Dict[str, str]]] = None, context: Optional[ConversationContext] = None,
+                 provider: str = "openai"):
+        self.gateway = gateway
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.provider = provider
+        # The caller may pass in a list it persists (e.g. Streamlit session state); it is updated in place
+        self.messages = messages if messages is not None else []
+        if system_prompt and not any(m.get("role") == "system" for m in self.messages):
+            self.messages.insert(0, {"role": "system", "content": system_prompt})
+        self.context = context or ConversationContext()
+        self.context.budget = history_budget
+        self.context.summarize = self.summarize
+
+    def summarize(self, summary: str, dropped: list) -> str:
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in dropped)
+        try:
+            request = ChatRequest(
+                model=self.model,
+                messages=(
+                    ("system", SUMMARY_INSTRUCTION),
+                    ("user", f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"),
+                ),
+                temperature=0,
+                max_tokens=min(300, self.context.summary_budget),
+            )
+            return self.gateway.complete(self.provider, request).text or extractive_summary(summary, dropped)
+        except Exception:
+            return extractive_summary(summary, dropped)
+
+    def request(self) -> ChatRequest:
+        return ChatRequest.from_dicts(
+            self.model,
+            self.context.build(self.messages),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Add the user's prompt, then yield the reply's tokens; the reply is stored once fully consumed."""
+        self.messages.append({"role": "user", "content": prompt})
+        parts = []
+        for token in self.gateway.stream(self.provider, self.request()):
+            parts.append(token)
+            yield token
+        self.messages.append({"role": "assistant", "content": "".join(parts)})
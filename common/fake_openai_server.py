@@ -0,0 +1,166 @@
+"""Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Serves POST /v1/chat/completions, both plain JSON and `stream: true` SSE, with
+injectable time-to-first-token, token rate, jitter and error rate, so the apps
+can be load-tested offline. Answers are filler words; only timing is realistic.
+
+As a library:
+
+    with FakeOpenAIServer(latency=0.3, tokens_per_sec=50) as server:
+        client = OpenAI(api_key="fake", base_url=server.base_url)
+
+Or standalone, pointing an app at it with OPENAI_BASE_URL:
+
+    python -m common.fake_openai_server --port 8001 --latency-ms 300
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("the", "policy", "covers", "salary", "claims", "and", "benefits", "per", "month", "of", "your", "plan")
+
+
+class FakeOpenAIServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.2, tokens_per_sec: float = 50.0,
+                 answer_tokens: int = 40, jitter: float = 0.0, error_rate: float = 0.0):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.answer_tokens = answer_tokens
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _first_token_delay(self) -> float:
+        return max(0.0, self.latency * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, as the real APIs
+            # Headers and body go out in separate writes; with Nagle on, each response
+            # waits on the client's delayed ACK (~40 ms) and that floor swamps the timings
+            disable_nagle_algorithm = True
+
+            def handle(self):
+                # Clients that hang up mid-stream are normal in a load test, not a server error
+                try:
+                    super().handle()
+                except (ConnectionResetError, BrokenPipeError):
+                    pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                if not self.path.endswith("/chat/completions"):
+                    return self._json(404, {"error": {"message": f"unknown path {self.path}"}})
+                if random.random() < server.error_rate:
+                    return self._json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+
+                model = body.get("model", "fake")
+                n = min(server.answer_tokens, body.get("max_tokens") or server.answer_tokens)
+                words = [random.choice(WORDS) for _ in range(n)]
+                time.sleep(server._first_token_delay())
+                if body.get("stream"):
+                    self._stream(model, words)
+                else:
+                    time.sleep(n / server.tokens_per_sec)
+                    self._json(200, {
+                        "id": "fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": " ".join(words)},
+                                     "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": n, "total_tokens": n},
+                    })
+
+            def _json(self, status: int, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _chunk(self, data: bytes):
+                # SSE has no Content-Length, so keep-alive needs chunked transfer encoding
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _event(self, model: str, delta: dict, finish_reason=None):
+                chunk = {"id": "fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                         "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+                self._chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+
+            def _stream(self, model: str, words):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self._event(model, {"role": "assistant", "content": ""})
+                for i, word in enumerate(words):
+                    if i:
+                        time.sleep(1 / server.tokens_per_sec)
+                    self._event(model, {"content": word if i == 0 else " " + word})
+                self._event(model, {}, finish_reason="stop")
+                self._chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="fake generation speed")
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument("--jitter", type=float, default=0.2, help="+/- fraction applied to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+
+
+def server_from_args(args, port: int = 0) -> FakeOpenAIServer:
+    return FakeOpenAIServer(port=port, latency=args.latency_ms / 1000, tokens_per_sec=args.tokens_per_sec,
+                            answer_tokens=args.answer_tokens, jitter=args.jitter, error_rate=args.error_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8001)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    server = server_from_args(args, port=args.port)
+    print(f"Fake OpenAI API at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
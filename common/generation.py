@@ -0,0 +1,85 @@
+"""Batched generation for the seq2seq prompt scripts.
+
+Prompts are read from a file (one per line), sorted by token length so each
+batch pads to a similar size, and run through padded `generate` calls with the
+KV cache on. Outputs are printed as JSONL as soon as their batch finishes, and
+tokens/sec is reported per batch size:
+
+    python main.py --prompts prompts.txt --batch-size 8 --decoding beam
+    python main.py --prompts prompts.txt --sweep 1,2,4,8,16
+"""
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+DECODING = {
+    "greedy": {"do_sample": False, "num_beams": 1},
+    "beam": {"do_sample": False, "num_beams": 4, "early_stopping": True},
+    "sampling": {"do_sample": True, "top_p": 0.9, "temperature": 0.8},
+}
+
+
+def add_batch_arguments(parser) -> None:
+    parser.add_argument("--prompts", metavar="FILE", help="generate for every line of FILE instead of the built-in prompt")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--decoding", choices=DECODING, default="greedy")
+    parser.add_argument("--sweep", metavar="SIZES", help="comma-separated batch sizes to benchmark, e.g. 1,2,4,8")
+
+
+def read_prompts(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def generate_batches(
+    tokenizer, model, prompts: List[str], batch_size: int, decoding: str, max_new_tokens: int
+) -> Iterator[Tuple[List[int], List[str], Dict[str, float]]]:
+    """Yield (prompt indices, outputs, stats) per batch, shortest prompts first."""
+    import torch
+
+    lengths = [len(ids) for ids in tokenizer(prompts, truncation=True)["input_ids"]]
+    order = sorted(range(len(prompts)), key=lengths.__getitem__)
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        enc = tokenizer([prompts[i] for i in idx], padding=True, truncation=True, return_tensors="pt")
+        t = time.perf_counter()
+        with torch.inference_mode():
+            out = model.generate(**enc, max_new_tokens=max_new_tokens, use_cache=True, **DECODING[decoding])
+        elapsed = time.perf_counter() - t
+        generated = int((out != tokenizer.pad_token_id).sum())
+        yield idx, tokenizer.batch_decode(out, skip_special_tokens=True), {"tokens": generated, "seconds": elapsed}
+
+
+def _report(totals: Dict[int, List[float]]) -> None:
+    print(f"{'batch':>6} {'tokens':>8} {'seconds':>8} {'tokens/s':>9}", file=sys.stderr)
+    for size, (tokens, seconds) in sorted(totals.items()):
+        print(f"{size:>6} {int(tokens):>8} {seconds:>8.2f} {tokens / seconds:>9.1f}", file=sys.stderr)
+
+
+def run_batch(args, tokenizer, model, max_new_tokens: int) -> bool:
+    """Handle --prompts/--sweep; False means the script should run its single prompt."""
+    if not args.prompts:
+        return False
+    prompts = read_prompts(args.prompts)
+
+    if args.sweep:
+        totals = {}
+        for size in (int(s) for s in args.sweep.split(",")):
+            tokens = seconds = 0.0
+            for _, _, stats in generate_batches(tokenizer, model, prompts, size, args.decoding, max_new_tokens):
+                tokens += stats["tokens"]
+                seconds += stats["seconds"]
+            totals[size] = [tokens, seconds]
+        _report(totals)
+        return True
+
+    totals = defaultdict(lambda: [0.0, 0.0])
+    for idx, outputs, stats in generate_batches(tokenizer, model, prompts, args.batch_size, args.decoding, max_new_tokens):
+        for i, output in zip(idx, outputs):
+            print(json.dumps({"id": i, "prompt": prompts[i], "output": output}, ensure_ascii=False), flush=True)
+        totals[len(idx)][0] += stats["tokens"]
+        totals[len(idx)][1] += stats["seconds"]
+    _report(totals)
+    return True
@@ -0,0 +1,74 @@
+"""Selectable CPU inference backends for the local Hugging Face models.
+
+- fp32: stock PyTorch weights
+- int8: dynamic int8 quantization of every nn.Linear (weights int8, activations
+  quantized on the fly); no calibration data needed
+- onnx: ONNX Runtime via optimum; the export is cached under ONNX_CACHE and
+  reused on later runs
+
+optimum/onnxruntime are only imported when the onnx backend is requested.
+"""
+import os
+import shutil
+from pathlib import Path
+
+BACKENDS = ("fp32", "int8", "onnx")
+ONNX_CACHE = Path(os.getenv("HF_ONNX_CACHE", Path(__file__).resolve().parents[1] / ".onnx_cache"))
+
+
+def add_backend_argument(parser) -> None:
+    parser.add_argument("--backend", choices=BACKENDS, default="fp32", help="inference backend (default: fp32)")
+
+
+def _quantize(model):
+    import torch
+
+    return torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(ort_class, model_id: str):
+    path = ONNX_CACHE / model_id.replace("/", "--")
+    if (path / "config.json").exists():
+        return ort_class.from_pretrained(path)
+    model = ort_class.from_pretrained(model_id, export=True)
+    # Export to a per-process temp dir and rename, so workers exporting at once never
+    # see a half-written directory; if another process got there first, keep its copy
+    ONNX_CACHE.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    model.save_pretrained(tmp)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return model
+
+
+def _load(model_id: str, backend: str, torch_class_name: str, ort_class_name: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    if backend == "onnx":
+        import optimum.onnxruntime
+
+        return tokenizer, _load_onnx(getattr(optimum.onnxruntime, ort_class_name), model_id)
+
+    import transformers
+
+    # low_cpu_mem_usage skips the random-init copy; safetensors checkpoints are mmapped
+    model = getattr(transformers, torch_class_name).from_pretrained(model_id, low_cpu_mem_usage=True).eval()
+    if backend == "int8":
+        model = _quantize(model)
+    return tokenizer, model
+
+
+def load_seq2seq(model_id: str, backend: str = "fp32"):
+    """(tokenizer, model) for a text-to-text model such as FLAN-T5."""
+    return _load(model_id, backend, "AutoModelForSeq2SeqLM", "ORTModelForSeq2SeqLM")
+
+
+def load_classifier(model_id: str, backend: str = "fp32"):
+    """(tokenizer, model) for a sequence classification model."""
+    return _load(model_id, backend, "AutoModelForSequenceClassification", "ORTModelForSequenceClassification")
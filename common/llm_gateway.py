@@ -0,0 +1,279 @@
+"""One way for every app to talk to an LLM.
+
+`LLMGateway` puts a common sync / async / streaming interface in front of
+provider adapters (OpenAI-compatible HTTP APIs such as OpenAI and Groq,
+Bedrock, and an offline fake), with:
+
+- a pooled keep-alive connection per provider, shared by all callers
+- in-flight coalescing: identical concurrent `complete` calls share one
+  upstream request
+- per-provider latency, error and token metrics
+
+Provider SDKs (openai, boto3) are imported only when that provider is built.
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+Messages = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class ChatRequest:
+    model: str
+    messages: Messages
+    temperature: float = 0.2
+    max_tokens: int = 512
+
+    @classmethod
+    def from_dicts(cls, model: str, messages: Sequence[dict], **kwargs) -> "ChatRequest":
+        return cls(model=model, messages=tuple((m["role"], m["content"]) for m in messages), **kwargs)
+
+
+@dataclass
+class ChatResult:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class Provider:
+    name = "provider"
+
+    def complete(self, request: ChatRequest) -> ChatResult:
+        raise NotImplementedError
+
+    def stream(self, request: ChatRequest) -> Iterator[str]:
+        # Providers without native streaming yield the whole answer at once
+        yield self.complete(request).text
+
+
+class OpenAICompatibleProvider(Provider):
+    """OpenAI and any OpenAI-compatible endpoint (e.g. Groq at https://api.groq.com/openai/v1)."""
+
+    def __init__(self, name: str, api_key: str, base_url: Optional[str] = None, max_connections: int = 32):
+        import httpx
+        from openai import OpenAI
+
+        self.name = name
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2)
+        self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=httpx.Client(limits=limits, timeout=60.0))
+
+    def _messages(self, request: ChatRequest):
+        return [{"role": role, "content": content} for role, content in request.messages]
+
+    def complete(self, request: ChatRequest) -> ChatResult:
+        resp = self.client.chat.completions.create(
+            model=request.model,
+            messages=self._messages(request),
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+        )
+        usage = resp.usage
+        return ChatResult(
+            text=resp.choices[0].message.content or "",
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    def stream(self, request: ChatRequest) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=request.model,
+            messages=self._messages(request),
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class BedrockProvider(Provider):
+    """Bedrock models that take a plain `prompt` and return `generation` (e.g. Llama 3)."""
+
+    name = "bedrock"
+
+    def __init__(self, region: str = "ap-south-1", max_connections: int = 32, retries: Optional[dict] = None):
+        import boto3
+        from botocore.config import Config
+
+        # `retries` is botocore's retry config, e.g. {"total_max_attempts": 1} for callers that retry themselves
+        config = Config(max_pool_connections=max_connections, retries=retries)
+        self.client = boto3.client("bedrock-runtime", region_name=region, config=config)
+
+    @staticmethod
+    def _body(request: ChatRequest) -> str:
+        prompt = "\n\n".join(content if role == "user" else f"{role}: {content}" for role, content in request.messages)
+        return json.dumps({"prompt": prompt, "temperature": request.temperature, "max_gen_len": request.max_tokens})
+
+    def complete(self, request: ChatRequest) -> ChatResult:
+        resp = self.client.invoke_model(
+            modelId=request.model, body=self._body(request), accept="application/json", contentType="application/json"
+        )
+        result = json.loads(resp["body"].read())
+        return ChatResult(
+            text=result.get("generation", ""),
+            prompt_tokens=result.get("prompt_token_count", 0),
+            completion_tokens=result.get("generation_token_count", 0),
+        )
+
+    def stream(self, request: ChatRequest) -> Iterator[str]:
+        resp = self.client.invoke_model_with_response_stream(
+            modelId=request.model, body=self._body(request), accept="application/json", contentType="application/json"
+        )
+        for event in resp["body"]:
+            if "chunk" in event:
+                text = json.loads(event["chunk"]["bytes"]).get("generation", "")
+                if text:
+                    yield text
+
+
+class FakeProvider(Provider):
+    """Offline provider for load tests: fixed latency, then echoes the last user message."""
+
+    def __init__(self, name: str = "fake", latency: float = 0.2, tokens_per_sec: float = 200.0):
+        self.name = name
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, request: ChatRequest):
+        with self._lock:
+            self.calls += 1
+        last_user = next((c for r, c in reversed(request.messages) if r == "user"), "")
+        return f"Echo: {last_user}".split(" ")
+
+    def complete(self, request: ChatRequest) -> ChatResult:
+        words = self._answer(request)
+        time.sleep(self.latency + len(words) / self.tokens_per_sec)
+        return ChatResult(text=" ".join(words), prompt_tokens=sum(len(c.split()) for _, c in request.messages),
+                          completion_tokens=len(words))
+
+    def stream(self, request: ChatRequest) -> Iterator[str]:
+        words = self._answer(request)
+        time.sleep(self.latency)
+        for i, word in enumerate(words):
+            time.sleep(1 / self.tokens_per_sec)
+            yield word if i == 0 else " " + word
+
+
+class ProviderMetrics:
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=window)
+        self.ttft = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        def pct(values, q):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "p50_ms": pct(self.latencies, 0.5),
+            "p95_ms": pct(self.latencies, 0.95),
+            "ttft_p50_ms": round(statistics.median(self.ttft) * 1000, 1) if self.ttft else None,
+        }
+
+
+class LLMGateway:
+    def __init__(self):
+        self.providers: Dict[str, Provider] = {}
+        self.metrics: Dict[str, ProviderMetrics] = {}
+        self._inflight: Dict[Tuple[str, ChatRequest], Future] = {}
+        self._lock = threading.Lock()
+
+    def register(self, provider: Provider) -> Provider:
+        with self._lock:
+            self.providers[provider.name] = provider
+            self.metrics.setdefault(provider.name, ProviderMetrics())
+        return provider
+
+    def _provider(self, name: str) -> Provider:
+        try:
+            return self.providers[name]
+        except KeyError:
+            raise ValueError(f"No LLM provider registered as '{name}'") from None
+
+    def complete(self, provider: str, request: ChatRequest) -> ChatResult:
+        backend = self._provider(provider)
+        metrics = self.metrics[provider]
+        key = (provider, request)
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                shared = self._inflight[key] = Future()
+                leader = True
+            else:
+                metrics.coalesced += 1
+                leader = False
+        if not leader:
+            return shared.result()
+
+        start = time.perf_counter()
+        try:
+            result = backend.complete(request)
+        except Exception as e:
+            with self._lock:
+                metrics.errors += 1
+                del self._inflight[key]
+            shared.set_exception(e)
+            raise
+        with self._lock:
+            metrics.requests += 1
+            metrics.latencies.append(time.perf_counter() - start)
+            metrics.prompt_tokens += result.prompt_tokens
+            metrics.completion_tokens += result.completion_tokens
+            del self._inflight[key]
+        shared.set_result(result)
+        return result
+
+    async def acomplete(self, provider: str, request: ChatRequest) -> ChatResult:
+        # Runs the blocking client on a worker thread; coalescing is shared with complete()
+        return await asyncio.to_thread(self.complete, provider, request)
+
+    def stream(self, provider: str, request: ChatRequest) -> Iterator[str]:
+        """Stream tokens; not coalesced, since every caller consumes its own stream."""
+        backend = self._provider(provider)
+        metrics = self.metrics[provider]
+        start = time.perf_counter()
+        first = None
+        tokens = 0
+        try:
+            for token in backend.stream(request):
+                if first is None:
+                    first = time.perf_counter()
+                tokens += 1
+                yield token
+        except Exception:
+            with self._lock:
+                metrics.errors += 1
+            raise
+        with self._lock:
+            metrics.requests += 1
+            metrics.latencies.append(time.perf_counter() - start)
+            metrics.completion_tokens += tokens
+            if first is not None:
+                metrics.ttft.append(first - start)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: m.snapshot() for name, m in self.metrics.items()}
@@ -0,0 +1,125 @@
+"""Closed-loop load generator for streaming calls, with JSON results for run-to-run comparison.
+
+A call takes a request number and returns an iterator of tokens (non-streaming
+paths yield the whole answer once). `concurrency` workers issue `requests`
+calls between them; each one records time to first token and total latency.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+RESULTS_DIR = Path("bench_results")
+
+
+def add_load_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=2, help="sequential requests before timing starts")
+    parser.add_argument("--save", metavar="NAME", help=f"save results as {RESULTS_DIR}/NAME-<timestamp>.json")
+    parser.add_argument("--baseline", metavar="FILE", help="earlier results JSON to compare against")
+
+
+def _summary(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+    return {"mean": round(statistics.mean(ordered) * 1000, 1), "p50": pct(0.5), "p95": pct(0.95), "p99": pct(0.99)}
+
+
+def run_load(call: Callable[[int], Iterable[str]], requests: int, concurrency: int, warmup: int = 0) -> dict:
+    for i in range(warmup):
+        for _ in call(-1 - i):
+            pass
+
+    latencies, ttfts, errors = [], [], []
+    tokens = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal tokens
+        start = time.perf_counter()
+        first = None
+        n = 0
+        try:
+            for _ in call(i):
+                if first is None:
+                    first = time.perf_counter()
+                n += 1
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+            return
+        end = time.perf_counter()
+        with lock:
+            latencies.append(end - start)
+            ttfts.append((first or end) - start)
+            tokens += n
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 2),
+        "tokens_per_sec": round(tokens / elapsed, 1),
+        "latency_ms": _summary(latencies),
+        "ttft_ms": _summary(ttfts),
+    }
+
+
+def print_results(results: dict):
+    print(f"{results['requests']} requests, concurrency {results['concurrency']}, {results['errors']} errors "
+          f"in {results['elapsed_s']}s")
+    print(f"  throughput  {results['requests_per_sec']} req/s, {results['tokens_per_sec']} tokens/s")
+    for key in ("ttft_ms", "latency_ms"):
+        s = results[key]
+        if s:
+            print(f"  {key:<11} mean={s['mean']} p50={s['p50']} p95={s['p95']} p99={s['p99']}")
+    for sample in results["error_samples"]:
+        print(f"  error: {sample}")
+
+
+def save_results(results: dict, name: str, config: dict) -> Path:
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = RESULTS_DIR / f"{name}-{stamp}.json"
+    path.write_text(json.dumps({"name": name, "time": stamp, "config": config, "results": results}, indent=2))
+    return path
+
+
+def compare(results: dict, baseline_path: str):
+    """Print each headline metric next to the baseline run's, with the relative change."""
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    rows = [("req/s", results["requests_per_sec"], baseline["requests_per_sec"])]
+    for key in ("ttft_ms", "latency_ms"):
+        for q in ("p50", "p95", "p99"):
+            if results[key] and baseline[key]:
+                rows.append((f"{key[:-3]} {q} ms", results[key][q], baseline[key][q]))
+    print(f"vs {baseline_path}:")
+    for label, now, then in rows:
+        change = f"{(now - then) / then:+.1%}" if then else "n/a"
+        print(f"  {label:<16} {then:>9} -> {now:<9} {change}")
+
+
+def report(results: dict, args, config: dict):
+    print_results(results)
+    if args.save:
+        print(f"saved {save_results(results, args.save, config)}")
+    if args.baseline:
+        compare(results, args.baseline)
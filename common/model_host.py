@@ -0,0 +1,113 @@
+"""Keeps Hugging Face models resident and serves many prompts per process.
+
+`get_model` loads each (kind, model, backend) once per process; torch and
+transformers are only imported on that first load, so `--help` and argument
+errors stay instant. `run_host` turns a script's per-prompt function into a
+stdin REPL or a small local HTTP server:
+
+    python main.py --repl
+    python main.py --serve 8000
+    curl -s localhost:8000 -d '{"input": "Why is the sky blue?"}'
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, Tuple
+
+from common.hf_backends import load_classifier, load_seq2seq
+
+_PROCESS_START = time.perf_counter()
+_LOADERS = {"seq2seq": load_seq2seq, "classifier": load_classifier}
+_MODELS: Dict[Tuple[str, str, str], Tuple[Any, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def _log(message: str) -> None:
+    print(f"[model-host] {message}", file=sys.stderr, flush=True)
+
+
+def get_model(kind: str, model_id: str, backend: str = "fp32"):
+    """(tokenizer, model), loaded on first use and then shared by the whole process."""
+    key = (kind, model_id, backend)
+    with _LOCK:
+        if key not in _MODELS:
+            start = time.perf_counter()
+            _MODELS[key] = _LOADERS[kind](model_id, backend)
+            _log(f"loaded {model_id} ({backend}) in {time.perf_counter() - start:.2f}s, "
+                 f"{time.perf_counter() - _PROCESS_START:.2f}s after startup")
+        return _MODELS[key]
+
+
+def add_host_arguments(parser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--repl", action="store_true", help="read prompts from stdin, one per line")
+    group.add_argument("--serve", type=int, metavar="PORT", help="serve POST {\"input\": ...} on localhost:PORT")
+
+
+class _Timed:
+    def __init__(self, handler: Callable[[str], Any]):
+        self.handler = handler
+        self.first = True
+
+    def __call__(self, text: str) -> Any:
+        start = time.perf_counter()
+        result = self.handler(text)
+        if self.first:
+            self.first = False
+            _log(f"first request took {(time.perf_counter() - start) * 1000:.0f} ms, "
+                 f"{time.perf_counter() - _PROCESS_START:.2f}s after startup")
+        return result
+
+
+def _repl(handler: Callable[[str], Any]) -> None:
+    _log("ready; enter one prompt per line (Ctrl-D to quit)")
+    for line in sys.stdin:
+        if line.strip():
+            print(handler(line.strip()), flush=True)
+
+
+def _serve(handler: Callable[[str], Any], port: int) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: dict):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(200, {"status": "ok"})
+
+        def do_POST(self):
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                self._reply(200, {"output": handler(request["input"])})
+            except (KeyError, ValueError) as e:
+                self._reply(400, {"error": f"expected JSON body with 'input': {e}"})
+
+        def log_message(self, *args):
+            pass
+
+    # Single-threaded on purpose: one model, requests are served one at a time
+    server = HTTPServer(("127.0.0.1", port), Handler)
+    _log(f"serving on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def run_host(args, handler: Callable[[str], Any]) -> bool:
+    """Run the REPL or server if requested by `args`; False means run once as usual."""
+    if args.repl:
+        _repl(_Timed(handler))
+    elif args.serve:
+        _serve(_Timed(handler), args.serve)
+    else:
+        return False
+    return True